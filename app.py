@@ -4,38 +4,75 @@ Main application file with Flask configuration and route registration
 """
 
 import os
+import time
+import queue
+import threading
+import atexit
 import logging
+import logging.handlers
 from datetime import datetime
-from flask import Flask, jsonify, request
+from flask import Flask, Response, jsonify, request
+import orjson
 from flask_cors import CORS
+from flask_compress import Compress
 from dotenv import load_dotenv
+from utils.orjson_provider import OrJSONProvider
 
 # Load environment variables
 load_dotenv()
 
-# Configure logging (console-only for deployment; no local file writes)
+# Configure logging (console-only by default; set LOG_FILE to also write a buffered log file)
 # Use WARNING level in production to reduce I/O overhead, INFO in development
 log_level = os.getenv('LOG_LEVEL', 'INFO').upper()
 if log_level not in ['DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL']:
     log_level = 'INFO'
 
+log_level_no = getattr(logging, log_level)
+# Resolved once at import; request hooks read these flags instead of
+# re-checking the level on every request
+_DEBUG_ENABLED = log_level_no <= logging.DEBUG
+_LOG_FORMAT_SIMPLE = log_level_no >= logging.WARNING
+
 logger = logging.getLogger("VidyAI_Flask")
-logger.setLevel(getattr(logging, log_level))
+logger.setLevel(log_level_no)
 
 if not logger.handlers:
     console_handler = logging.StreamHandler()
-    console_handler.setLevel(getattr(logging, log_level))
+    console_handler.setLevel(log_level_no)
     # Simplified formatter for production (less overhead)
-    if log_level == 'WARNING':
+    if _LOG_FORMAT_SIMPLE:
         formatter = logging.Formatter('%(levelname)s - %(message)s')
     else:
         formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
     console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
+    log_handlers = [console_handler]
+
+    # Optional log file (LOG_FILE); records are buffered in memory and written
+    # in batches, while ERROR and above flush the buffer immediately
+    log_file = os.getenv('LOG_FILE')
+    if log_file:
+        file_handler = logging.FileHandler(log_file, encoding='utf-8', delay=True)
+        file_handler.setFormatter(formatter)
+        file_buffer = logging.handlers.MemoryHandler(
+            512, flushLevel=logging.ERROR, target=file_handler, flushOnClose=True
+        )
+        file_buffer.setLevel(log_level_no)
+        log_handlers.append(file_buffer)
+        atexit.register(file_buffer.flush)
+
+    # Request threads only enqueue records; a single listener thread owns the
+    # real handlers so stream writes never block a request
+    log_queue = queue.Queue(-1)
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    log_listener = logging.handlers.QueueListener(log_queue, *log_handlers, respect_handler_level=True)
+    log_listener.start()
+    atexit.register(log_listener.stop)
     logger.propagate = False
 
 # Initialize Flask app
 app = Flask(__name__)
+# jsonify / request.get_json go through orjson
+app.json = OrJSONProvider(app)
 
 # Configuration
 app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'your-secret-key-change-in-production')
@@ -45,128 +82,185 @@ app.config['MAX_CONTENT_LENGTH'] = int(os.getenv('MAX_CONTENT_LENGTH', 104857600
 cors_origins_env = os.getenv('CORS_ORIGINS', 'http://localhost:8080,https://vizuara-vidyai.vercel.app')
 # Strip whitespace and trailing slashes from origins
 cors_origins = [origin.strip().rstrip('/') for origin in cors_origins_env.split(',') if origin.strip()]
+# Hashed copy for per-request membership checks
+cors_origins_set = frozenset(cors_origins)
+
+# How long browsers may cache preflight results (seconds)
+cors_max_age = int(os.getenv('CORS_MAX_AGE', 86400))
 
 # Store in app config for access from routes
 app.config['CORS_ORIGINS'] = cors_origins
+app.config['CORS_ORIGINS_SET'] = cors_origins_set
+app.config['CORS_MAX_AGE'] = cors_max_age
+
+# Fallback CORS headers for error responses. Registered before CORS() so it
+# runs after Flask-CORS's own after_request hook and only fills in when that
+# hook left the response without an Allow-Origin header.
+@app.after_request
+def add_cors(response):
+    """Attach CORS headers for allowed origins if Flask-CORS did not"""
+    if 'Access-Control-Allow-Origin' not in response.headers:
+        origin = request.headers.get('Origin')
+        if origin and origin.rstrip('/') in cors_origins_set:
+            response.headers['Access-Control-Allow-Origin'] = origin
+            response.headers['Access-Control-Allow-Credentials'] = 'true'
+            response.vary.add('Origin')
+    return response
 
-# Configure CORS - use multiple patterns to ensure all routes are covered
+# Configure CORS - /api/.* also covers /api/health, so it has no entry of its own
 # Flask-CORS will automatically handle OPTIONS preflight requests
 cors = CORS(app, 
     resources={
         r"/api/.*": {
             "origins": cors_origins,
             "methods": ["GET", "POST", "PUT", "DELETE", "OPTIONS", "PATCH", "HEAD"],
-            "allow_headers": ["Content-Type", "Authorization", "X-Requested-With", "Accept", "Origin"],
-            "expose_headers": ["Content-Type", "Content-Length"],
+            "allow_headers": ["Content-Type", "Authorization", "X-Requested-With", "Accept", "Origin", "X-Bucket", "X-Path"],
+            "expose_headers": [
+                "Content-Type", "Content-Length", "Content-Disposition", "X-Duration-Estimate", "X-Scene-Number",
+                "X-Title-Sanitized", "X-Video-Path", "X-Video-URL", "X-Subtitles-Path", "X-Subtitles-URL", "X-Timings"
+            ],
             "supports_credentials": True,
-            "max_age": 3600
-        },
-        r"/api/health": {
-            "origins": cors_origins,
-            "methods": ["GET", "OPTIONS", "HEAD"],
-            "allow_headers": ["Content-Type", "Authorization", "X-Requested-With", "Accept", "Origin"],
-            "supports_credentials": True,
-            "max_age": 3600
+            "max_age": cors_max_age
         },
         r"/": {
             "origins": cors_origins,
             "methods": ["GET", "OPTIONS", "HEAD"],
             "allow_headers": ["Content-Type", "Authorization", "X-Requested-With", "Accept", "Origin"],
-            "supports_credentials": True
+            "supports_credentials": True,
+            "max_age": cors_max_age
         }
     },
     supports_credentials=True,
     automatic_options=True,
-    intercept_exceptions=True
+    intercept_exceptions=False
 )
 
+# Response compression - base64-heavy JSON (images, audio) shrinks close to
+# its binary size. Level 4 keeps encode CPU below the transfer time saved.
+# Streamed responses (NDJSON audio, SSE progress) are left uncompressed so
+# each chunk is flushed to the client as soon as it is produced.
+# Only text bodies are considered: audio/video/image payloads are already
+# compressed and would just burn CPU.
+app.config['COMPRESS_MIMETYPES'] = ['application/json', 'text/plain']
+app.config['COMPRESS_ALGORITHM'] = ['br', 'gzip']
+app.config['COMPRESS_MIN_SIZE'] = int(os.getenv('COMPRESS_MIN_SIZE', 512))
+app.config['COMPRESS_LEVEL'] = 4
+app.config['COMPRESS_BR_LEVEL'] = 4
+app.config['COMPRESS_STREAMS'] = False
+Compress(app)
+
 # Add request logging middleware AFTER CORS initialization
 # Only log errors and warnings in production to reduce I/O overhead
 @app.before_request
 def log_request_info():
     """Log incoming requests for debugging"""
-    if log_level == 'DEBUG':
-        logger.debug(f"Request: {request.method} {request.path} from {request.remote_addr}")
+    # Bail out before building any message when DEBUG is filtered
+    if not _DEBUG_ENABLED:
+        return
+    method = request.method
+    logger.debug("Request: %s %s from %s", method, request.path, request.remote_addr)
     # Only log OPTIONS in debug mode (too verbose otherwise)
-    if request.method == 'OPTIONS' and log_level == 'DEBUG':
-        logger.debug(f"OPTIONS preflight - Origin: {request.headers.get('Origin')}")
+    if method == 'OPTIONS':
+        logger.debug("OPTIONS preflight - Origin: %s", request.headers.get('Origin'))
 
 @app.after_request
 def log_response_info(response):
     """Log response status for debugging - ensure CORS headers are present"""
     # Only log errors (4xx, 5xx) in production
-    if response.status_code >= 400:
-        logger.warning(f"Error {response.status_code} for {request.method} {request.path}")
-    elif log_level == 'DEBUG':
-        logger.debug(f"Response: {response.status_code} for {request.method} {request.path}")
+    status = response.status_code
+    if status >= 400:
+        logger.warning("Error %d for %s %s", status, request.method, request.path)
+    elif _DEBUG_ENABLED:
+        logger.debug("Response: %d for %s %s", status, request.method, request.path)
     return response
 
 # Import and register blueprints
+# Blueprints whose modules pull in heavy media/ML libraries (MoviePy, gTTS,
+# Gemini) are imported on their first request so cold start and /api/health
+# don't wait for them
+LAZY_BLUEPRINTS = {
+    '/api/images': ('routes.image_routes', 'image_bp'),
+    '/api/narration': ('routes.narration_routes', 'narration_bp'),
+    '/api/audio': ('routes.audio_routes', 'audio_bp'),
+    '/api/video': ('routes.video_routes', 'video_bp'),
+}
+
 try:
     from routes.wikipedia_routes import wikipedia_bp
     from routes.story_routes import story_bp
-    from routes.image_routes import image_bp
-    from routes.narration_routes import narration_bp
-    from routes.audio_routes import audio_bp
-    from routes.video_routes import video_bp
     from routes.storage_routes import storage_bp
     from routes.project_routes import project_bp
     from routes.progress_routes import progress_bp
+    from utils.lazy_blueprint import LazyBlueprint
     
     # Register blueprints
     app.register_blueprint(wikipedia_bp, url_prefix='/api/wikipedia')
     app.register_blueprint(story_bp, url_prefix='/api/story')
-    app.register_blueprint(image_bp, url_prefix='/api/images')
-    app.register_blueprint(narration_bp, url_prefix='/api/narration')
-    app.register_blueprint(audio_bp, url_prefix='/api/audio')
-    app.register_blueprint(video_bp, url_prefix='/api/video')
     app.register_blueprint(storage_bp, url_prefix='/api/storage')
     app.register_blueprint(progress_bp, url_prefix='/api/progress')
     app.register_blueprint(project_bp)  # No prefix, it already has /api/projects in the blueprint
     
+    for url_prefix, (module_name, bp_name) in LAZY_BLUEPRINTS.items():
+        LazyBlueprint(module_name, bp_name, url_prefix).register(app)
+    
+    # Each route should be registered exactly once; a duplicate means a
+    # blueprint was registered twice and every lookup scans extra rules
+    seen_routes = set()
+    for rule in app.url_map.iter_rules():
+        for method in rule.methods - {'HEAD', 'OPTIONS'}:
+            if (rule.rule, method) in seen_routes:
+                logger.warning("Duplicate route registered: %s %s", method, rule.rule)
+            seen_routes.add((rule.rule, method))
+    del seen_routes
+    
     logger.info("All blueprints registered successfully")
+    
+    # Prime the Supabase connection pool without delaying startup
+    from services.supabase_service import supabase_service
+    threading.Thread(target=supabase_service.warm_up, name="supabase-warmup", daemon=True).start()
 except Exception as e:
-    logger.error(f"Failed to import or register blueprints: {e}", exc_info=True)
+    logger.error("Failed to import or register blueprints: %s", e, exc_info=True)
     raise
 
+# Static response bodies, serialized once at import. Only the health timestamp
+# varies, so it is spliced between a fixed prefix and suffix per request.
+HEALTH_JSON_PREFIX = b'{"status":"healthy","service":"VidyAI Flask Backend","version":"1.0.0","timestamp":"'
+HEALTH_JSON_SUFFIX = b'"}'
+
+# Health timestamp cached at one-second granularity; concurrent refreshes
+# within the same second are harmless (same value)
+_health_ts_sec = [0]
+_health_ts = [b'']
+
+ROOT_JSON = orjson.dumps({
+    'message': 'VidyAI Flask Backend API',
+    'version': '1.0.0',
+    'endpoints': {
+        'health': '/api/health',
+        'wikipedia': '/api/wikipedia/*',
+        'story': '/api/story/*',
+        'images': '/api/images/*',
+        'narration': '/api/narration/*',
+        'audio': '/api/audio/*',
+        'video': '/api/video/*',
+        'storage': '/api/storage/*'
+    }
+})
+
 # Health check endpoint
-@app.route('/api/health', methods=['GET', 'OPTIONS'])
+@app.route('/api/health', methods=['GET'])
 def health_check():
     """Health check endpoint - simple endpoint that doesn't require external services"""
-    # Handle OPTIONS preflight request explicitly
-    if request.method == 'OPTIONS':
-        origin = request.headers.get('Origin')
-        # Normalize origin by removing trailing slash for comparison
-        origin_normalized = origin.rstrip('/') if origin else None
-        logger.info(f"Health check OPTIONS handler called - Origin: {origin}, Normalized: {origin_normalized}, Allowed origins: {cors_origins}")
-        
-        # Check if origin (normalized) is in allowed list
-        if origin_normalized and origin_normalized in cors_origins:
-            response = jsonify({})
-            response.headers.add('Access-Control-Allow-Origin', origin)
-            response.headers.add('Access-Control-Allow-Methods', 'GET, OPTIONS, HEAD')
-            response.headers.add('Access-Control-Allow-Headers', 'Content-Type, Authorization, X-Requested-With, Accept, Origin')
-            response.headers.add('Access-Control-Allow-Credentials', 'true')
-            response.headers.add('Access-Control-Max-Age', '3600')
-            logger.info(f"Returning OPTIONS response with CORS headers for origin: {origin}")
-            return response, 200
-        else:
-            logger.warning(f"OPTIONS request from disallowed origin: {origin} (not in {cors_origins})")
-            # Still return CORS headers but with error status
-            response = jsonify({'error': 'Origin not allowed'})
-            if origin:
-                response.headers.add('Access-Control-Allow-Origin', origin)
-            return response, 403
-    
+    # Preflight requests are answered by Flask-CORS (automatic_options=True)
     try:
-        return jsonify({
-            'status': 'healthy',
-            'service': 'VidyAI Flask Backend',
-            'version': '1.0.0',
-            'timestamp': datetime.now().isoformat()
-        }), 200
+        now = int(time.time())
+        if now != _health_ts_sec[0]:
+            _health_ts[0] = datetime.fromtimestamp(now).isoformat().encode()
+            _health_ts_sec[0] = now
+        body = HEALTH_JSON_PREFIX + _health_ts[0] + HEALTH_JSON_SUFFIX
+        return Response(body, status=200, mimetype='application/json')
     except Exception as e:
-        logger.error(f"Health check error: {e}")
+        logger.error("Health check error: %s", e)
         return jsonify({
             'status': 'error',
             'error': str(e)
@@ -176,20 +270,7 @@ def health_check():
 @app.route('/', methods=['GET'])
 def root():
     """Root endpoint with API information"""
-    return jsonify({
-        'message': 'VidyAI Flask Backend API',
-        'version': '1.0.0',
-        'endpoints': {
-            'health': '/api/health',
-            'wikipedia': '/api/wikipedia/*',
-            'story': '/api/story/*',
-            'images': '/api/images/*',
-            'narration': '/api/narration/*',
-            'audio': '/api/audio/*',
-            'video': '/api/video/*',
-            'storage': '/api/storage/*'
-        }
-    }), 200
+    return Response(ROOT_JSON, status=200, mimetype='application/json')
 
 # Error handlers
 @app.errorhandler(404)
@@ -203,7 +284,7 @@ def not_found(error):
 @app.errorhandler(500)
 def internal_error(error):
     """Handle 500 errors"""
-    logger.error(f"Internal server error: {str(error)}")
+    logger.error("Internal server error: %s", error)
     return jsonify({
         'error': 'Internal Server Error',
         'message': 'An internal error occurred'
@@ -224,9 +305,23 @@ if __name__ == '__main__':
     port = int(os.getenv('PORT', os.getenv('FLASK_PORT', 5000)))
     debug = os.getenv('FLASK_ENV', 'development') == 'development'
     
-    logger.info(f"Starting VidyAI Flask Backend on {host}:{port}")
-    logger.info(f"Debug mode: {debug}")
-    logger.info(f"CORS origins: {cors_origins}")
+    logger.info("Starting VidyAI Flask Backend on %s:%d", host, port)
+    logger.info("Debug mode: %s", debug)
+    logger.info("CORS origins: %s", cors_origins)
+    
+    if os.getenv('FLASK_ENV') == 'production':
+        # Hand the process over to gunicorn (same settings as the Procfile).
+        # A single worker keeps in-memory progress tracking consistent; threads
+        # let health checks through while a long video build is running.
+        threads = os.getenv('GUNICORN_THREADS', '4')
+        logger.info("Production mode: exec gunicorn (1 worker, %s threads)", threads)
+        os.execvp('gunicorn', [
+            'gunicorn', 'app:app',
+            '-b', f'{host}:{port}',
+            '-w', '1', '-k', 'gthread', '--threads', threads,
+            '--timeout', '2400',
+            '--max-requests', '1000', '--max-requests-jitter', '50'
+        ])
     
     app.run(host=host, port=port, debug=debug)
 
@@ -6,9 +6,13 @@ narrations, TTS audio, video, subtitles). No image generation is done.
 
 import os
 import json
-from typing import List, Dict
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional, Tuple
 
 import requests
+from requests.adapters import HTTPAdapter
 from dotenv import load_dotenv
 
 # Load env before importing services (Supabase client initializes on import)
@@ -26,112 +30,133 @@ IMAGES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "T
 OUTPUT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "test_narendra")
 # Aim for a ~30 second final video; scenes derive their pacing from this.
 TARGET_VIDEO_SECONDS = 30
+# Concurrent Groq narration calls / gTTS calls (kept modest to avoid throttling)
+NARRATION_CONCURRENCY = 8
+TTS_CONCURRENCY = 6
+
+logger = logging.getLogger("VidyAI_Flask")
+
+# Shared session so repeat Wikipedia fetches reuse the pooled keep-alive connection
+_session = requests.Session()
+_session.headers["User-Agent"] = "VidyAI/1.0"
+_session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=4))
 
 
 def _ensure_dir(path: str) -> None:
     os.makedirs(path, exist_ok=True)
 
 
-def load_images() -> List[bytes]:
+def list_image_files() -> List[str]:
+    """Return sorted image paths; no pixels are read until build_video renders each scene."""
     files = [f for f in os.listdir(IMAGES_DIR) if f.lower().endswith((".jpg", ".jpeg", ".png"))]
     files.sort()  # scene_1, scene_2, ...
     if not files:
         raise RuntimeError(f"No images found in {IMAGES_DIR}")
-    images = []
-    for fname in files:
-        with open(os.path.join(IMAGES_DIR, fname), "rb") as f:
-            images.append(f.read())
-    print(f"Loaded {len(images)} images from {IMAGES_DIR}")
-    return images
+    image_files = [os.path.join(IMAGES_DIR, fname) for fname in files]
+    logger.info("Found %d images in %s", len(image_files), IMAGES_DIR)
+    return image_files
 
 
 def fetch_wikipedia_content(title: str) -> str:
     """Fetch a compact page summary to seed storyline generation."""
     url = f"https://en.wikipedia.org/api/rest_v1/page/summary/{title.replace(' ', '%20')}"
     try:
-        resp = requests.get(url, timeout=10)
+        resp = _session.get(url, timeout=10)
         if resp.status_code == 200:
             data = resp.json()
             parts = [data.get("title", ""), data.get("description", ""), data.get("extract", "")]
             return "\n\n".join(p for p in parts if p)
     except Exception as e:
-        print(f"Warning: failed to fetch Wikipedia summary: {e}")
+        logger.warning("Failed to fetch Wikipedia summary: %s", e)
     return f"{title} biography and career highlights."
 
 
-def generate_story_and_prompts(num_scenes: int) -> Dict[str, any]:
+def _require_groq_key() -> str:
     groq_key = os.getenv("GROQ_API_KEY")
     if not groq_key:
         raise RuntimeError("GROQ_API_KEY is required")
-    story_service = StoryService(groq_key)
+    return groq_key
+
+
+def generate_story_and_prompts(content: str, num_scenes: int) -> Dict[str, any]:
+    story_service = StoryService(_require_groq_key())
 
-    content = fetch_wikipedia_content(TITLE)
-    storyline = story_service.generate_comic_storyline(
+    # One Groq call for both; falls back to the two-call path internally
+    return story_service.generate_storyline_and_prompts(
         title=TITLE,
         content=content,
+        num_scenes=num_scenes,
+        comic_style="western comic",
         target_length="medium",
         max_chars=20000,
         tone="enthusiastic",
         target_audience="general",
         complexity="moderate",
         focus_style="highlights",
-        scene_count=num_scenes,
         educational_level="intermediate",
         visual_style="documentary",
-    )
-
-    scene_prompts = story_service.generate_scene_prompts(
-        title=TITLE,
-        storyline=storyline,
-        comic_style="western comic",
-        num_scenes=num_scenes,
         age_group="general",
-        education_level="intermediate",
         visual_detail="moderate",
         camera_style="varied",
         color_palette="natural",
         scene_pacing="moderate",
     )
 
-    return {"storyline": storyline, "scene_prompts": scene_prompts}
 
-
-def generate_narrations(scene_prompts: List[str], target_scene_seconds: float) -> Dict[str, str]:
-    groq_key = os.getenv("GROQ_API_KEY")
-    if not groq_key:
-        raise RuntimeError("GROQ_API_KEY is required")
-    narration_service = NarrationService(groq_key)
+async def narrate_and_synthesize(
+    scene_prompts: List[str], target_scene_seconds: float
+) -> Tuple[Dict[str, str], Dict[str, bytes]]:
+    """
+    Generate each scene's narration and TTS audio as one task per scene, so a
+    scene's audio starts as soon as its narration is back instead of waiting
+    for every narration to finish.
+    """
+    narration_service = NarrationService(_require_groq_key())
+    narration_slots = asyncio.Semaphore(NARRATION_CONCURRENCY)
+    tts_slots = asyncio.Semaphore(TTS_CONCURRENCY)
+
+    async def run_scene(scene_number: int, prompt: str) -> Tuple[str, Optional[bytes]]:
+        async with narration_slots:
+            narration = await asyncio.to_thread(
+                narration_service.generate_scene_narration,
+                title=TITLE,
+                scene_prompt=prompt,
+                scene_number=scene_number,
+                storyline="",
+                narration_style="documentary",
+                voice_tone="engaging",
+                target_seconds=target_scene_seconds,
+                min_words=20,
+                max_words=50,
+            )
+        if not narration:
+            return narration, None
+
+        # A failed scene is reported and skipped rather than aborting the batch
+        async with tts_slots:
+            try:
+                audio = await asyncio.to_thread(
+                    tts_service.synthesize_to_mp3, narration, lang="en", tld="com", slow=False, speed=1.25
+                )
+            except Exception as e:
+                logger.warning("TTS failed for scene_%d: %s", scene_number, e)
+                audio = None
+        return narration, audio
+
+    results = await asyncio.gather(*(run_scene(i, p) for i, p in enumerate(scene_prompts, 1)))
 
     narrations: Dict[str, str] = {}
-    for i, prompt in enumerate(scene_prompts, 1):
-        narration = narration_service.generate_scene_narration(
-            title=TITLE,
-            scene_prompt=prompt,
-            scene_number=i,
-            storyline="",
-            narration_style="documentary",
-            voice_tone="engaging",
-            target_seconds=target_scene_seconds,
-            min_words=20,
-            max_words=50,
-        )
-        narrations[f"scene_{i}"] = narration
-    return narrations
-
-
-def synthesize_audio(narrations: Dict[str, str]) -> Dict[str, bytes]:
     scene_audio: Dict[str, bytes] = {}
-    for scene_key, text in narrations.items():
-        if not text:
-            continue
-        audio_data = tts_service.synthesize_to_mp3(text, lang="en", tld="com", slow=False, speed=1.25)
-        scene_audio[scene_key] = audio_data
-    return scene_audio
+    for i, (narration, audio) in enumerate(results, 1):
+        narrations[f"scene_{i}"] = narration
+        if audio:
+            scene_audio[f"scene_{i}"] = audio
+    return narrations, scene_audio
 
 
-def build_video(images: List[bytes], scene_audio: Dict[str, bytes], narrations_list: List[str]):
+def build_video(image_files: List[str], scene_audio: Dict[str, bytes], narrations_list: List[str]):
     result = video_service.build_video(
-        images=images,
+        images=image_files,
         scene_audio=scene_audio,
         title=TITLE,
         title_sanitized=TITLE_SANITIZED,
@@ -162,36 +187,47 @@ def save_outputs(result: Dict[str, any]):
     with open(timings_path, "w", encoding="utf-8") as f:
         json.dump(result.get("timings"), f, indent=2)
 
-    print(f"Saved video: {video_path}")
+    logger.info("Saved video: %s", video_path)
     if result.get("subtitles_bytes"):
-        print(f"Saved subtitles: {srt_path}")
-    print(f"Saved timings: {timings_path}")
+        logger.info("Saved subtitles: %s", srt_path)
+    logger.info("Saved timings: %s", timings_path)
 
 
-def main():
-    images = load_images()
-    num_scenes = len(images)
+async def run_pipeline():
+    # Blocking calls run on a pool large enough for both concurrency limits
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=NARRATION_CONCURRENCY + TTS_CONCURRENCY)
+    )
+
+    # The Wikipedia fetch and the image listing are independent
+    content, image_files = await asyncio.gather(
+        asyncio.to_thread(fetch_wikipedia_content, TITLE),
+        asyncio.to_thread(list_image_files),
+    )
+    num_scenes = len(image_files)
     target_scene_seconds = max(4.0, TARGET_VIDEO_SECONDS / max(1, num_scenes))
 
-    print("Generating storyline and scene prompts...")
-    story_data = generate_story_and_prompts(num_scenes)
+    logger.info("Generating storyline and scene prompts...")
+    story_data = await asyncio.to_thread(generate_story_and_prompts, content, num_scenes)
 
-    print("Generating narrations...")
-    narrations_dict = generate_narrations(story_data["scene_prompts"], target_scene_seconds)
+    logger.info("Generating narrations and audio...")
+    narrations_dict, scene_audio = await narrate_and_synthesize(story_data["scene_prompts"], target_scene_seconds)
     narrations_list = [narrations_dict.get(f"scene_{i}", "") for i in range(1, num_scenes + 1)]
 
-    print("Synthesizing audio...")
-    scene_audio = synthesize_audio(narrations_dict)
-
-    print("Building video with subtitles...")
-    result = build_video(images, scene_audio, narrations_list)
+    logger.info("Building video with subtitles...")
+    result = await asyncio.to_thread(build_video, image_files, scene_audio, narrations_list)
 
-    print("Saving outputs...")
+    logger.info("Saving outputs...")
     save_outputs(result)
 
-    print("Done. Check the MP4+SRT in:", OUTPUT_DIR)
+    logger.info("Done. Check the MP4+SRT in: %s", OUTPUT_DIR)
+
+
+def main():
+    asyncio.run(run_pipeline())
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
     main()
 
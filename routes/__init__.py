@@ -1,27 +1,30 @@
 """
 Routes Package
 API route blueprints
+
+Blueprints are resolved on first attribute access (PEP 562) so importing one
+route module does not import every other route module and its services.
 """
 
-from .wikipedia_routes import wikipedia_bp
-from .story_routes import story_bp
-from .image_routes import image_bp
-from .narration_routes import narration_bp
-from .audio_routes import audio_bp
-from .video_routes import video_bp
-from .storage_routes import storage_bp
-from .project_routes import project_bp
-from .progress_routes import progress_bp
+import importlib
+
+_BLUEPRINT_MODULES = {
+    'wikipedia_bp': 'wikipedia_routes',
+    'story_bp': 'story_routes',
+    'image_bp': 'image_routes',
+    'narration_bp': 'narration_routes',
+    'audio_bp': 'audio_routes',
+    'video_bp': 'video_routes',
+    'storage_bp': 'storage_routes',
+    'project_bp': 'project_routes',
+    'progress_bp': 'progress_routes'
+}
+
+__all__ = list(_BLUEPRINT_MODULES)
 
-__all__ = [
-    'wikipedia_bp',
-    'story_bp',
-    'image_bp',
-    'narration_bp',
-    'audio_bp',
-    'video_bp',
-    'storage_bp',
-    'project_bp',
-    'progress_bp'
-]
 
+def __getattr__(name):
+    module_name = _BLUEPRINT_MODULES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(f".{module_name}", __name__), name)
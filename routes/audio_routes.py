@@ -5,11 +5,13 @@ Endpoints for text-to-speech audio generation
 
 import os
 import logging
-import base64
-from flask import Blueprint, request, jsonify
+from collections import deque
+import orjson
+from flask import Blueprint, Response, request, jsonify
 from services.tts_service import tts_service
 from services.supabase_service import supabase_service
-from utils.helpers import sanitize_filename
+from utils.helpers import sanitize_filename, b64encode_str
+from utils.orjson_provider import json_response
 
 logger = logging.getLogger("VidyAI_Flask")
 
@@ -31,6 +33,11 @@ def generate_scene():
             "speed": float (optional, default: 1.25)
         }
     
+    Query params:
+        format: "binary" to receive the MP3 itself (audio/mpeg) instead of JSON;
+                duration and scene number are sent as X-Duration-Estimate and
+                X-Scene-Number headers
+    
     Response JSON:
         {
             "success": bool,
@@ -41,7 +48,7 @@ def generate_scene():
         }
     """
     try:
-        data = request.get_json()
+        data = request.get_json(silent=True, cache=False)
         
         if not data or 'text' not in data or 'scene_number' not in data:
             return jsonify({
@@ -62,18 +69,25 @@ def generate_scene():
         # Estimate duration
         duration = tts_service.estimate_tts_duration_seconds(text, speed)
         
+        # Raw MP3 skips the base64 + JSON wrapping entirely
+        if request.args.get('format') == 'binary':
+            return Response(audio_data, status=200, mimetype='audio/mpeg', headers={
+                'X-Duration-Estimate': str(duration),
+                'X-Scene-Number': str(scene_number)
+            })
+        
         # Convert to base64
-        audio_base64 = base64.b64encode(audio_data).decode('utf-8')
+        audio_base64 = b64encode_str(audio_data)
         
-        return jsonify({
+        return json_response({
             'success': True,
             'audio': audio_base64,
             'scene_number': scene_number,
             'duration_estimate': duration
-        }), 200
+        }, 200)
         
     except Exception as e:
-        logger.error(f"Error in generate_scene: {str(e)}")
+        logger.exception("Error in generate_scene")
         return jsonify({
             'success': False,
             'error': str(e)
@@ -96,6 +110,11 @@ def generate_all():
             "project_name": str (optional, for supabase path)
         }
     
+    Query params:
+        format: "ndjson" to stream one JSON line per scene as its audio is ready
+                ({"scene_key", "audio", "supabase_url" (if uploaded)}), followed
+                by a final {"success", "count"} line
+    
     Response JSON:
         {
             "success": bool,
@@ -106,7 +125,7 @@ def generate_all():
         }
     """
     try:
-        data = request.get_json()
+        data = request.get_json(silent=True, cache=False)
         
         if not data or 'narrations' not in data:
             return jsonify({
@@ -122,46 +141,84 @@ def generate_all():
         upload_to_supabase = data.get('upload_to_supabase', False)
         project_name = sanitize_filename(data.get('project_name', 'project'))
         
+        if request.args.get('format') == 'ndjson':
+            return Response(
+                _stream_scene_audios(narrations, lang, tld, slow, speed, upload_to_supabase, project_name),
+                status=200,
+                mimetype='application/x-ndjson'
+            )
+        
         # Generate all audio
-        scene_to_audio = tts_service.generate_scene_audios(
+        scene_audios = tts_service.generate_scene_audios(
             narrations, lang, tld, slow, speed
         )
         
-        # Convert to base64
+        # Upload to Supabase if requested (needs the raw bytes, so do it first)
+        supabase_urls = None
+        if upload_to_supabase:
+            # Storage paths are scene_<n>.mp3, so scenes without a number are not uploaded
+            numbered = [rec for rec in scene_audios if rec.scene_number is not None]
+            if len(numbered) < len(scene_audios):
+                logger.warning("Skipping upload of %d scenes without a scene number", len(scene_audios) - len(numbered))
+            results = supabase_service.upload_files([
+                ('audio', f"{project_name}/scene_{rec.scene_number}.mp3", rec.audio, 'audio/mpeg')
+                for rec in numbered
+            ])
+            supabase_urls = dict.fromkeys(rec.key for rec in scene_audios)
+            supabase_urls.update(
+                (rec.key, result['public_url'] if result['success'] else None)
+                for rec, result in zip(numbered, results)
+            )
+        
+        # Convert to base64, dropping each MP3 as soon as it is encoded so the
+        # raw bytes and their base64 copy are never all held at once
         audio_files = {}
-        for scene_key, audio_data in scene_to_audio.items():
-            audio_files[scene_key] = base64.b64encode(audio_data).decode('utf-8')
+        pending = deque(scene_audios)
+        del scene_audios
+        while pending:
+            rec = pending.popleft()
+            audio_files[rec.key] = b64encode_str(rec.audio)
         
         response = {
             'success': True,
             'audio_files': audio_files,
             'count': len(audio_files)
         }
-        
-        # Upload to Supabase if requested
-        if upload_to_supabase:
-            supabase_urls = {}
-            for scene_key, audio_data in scene_to_audio.items():
-                scene_num = scene_key.split('_')[1]
-                path = f"{project_name}/scene_{scene_num}.mp3"
-                result = supabase_service.upload_file('audio', path, audio_data, 'audio/mpeg')
-                if result['success']:
-                    supabase_urls[scene_key] = result['public_url']
-                else:
-                    supabase_urls[scene_key] = None
-            
+        if supabase_urls is not None:
             response['supabase_urls'] = supabase_urls
         
-        return jsonify(response), 200
+        return json_response(response, 200)
         
     except Exception as e:
-        logger.error(f"Error in generate_all: {str(e)}")
+        logger.exception("Error in generate_all")
         return jsonify({
             'success': False,
             'error': str(e)
         }), 500
 
 
+def _stream_scene_audios(narrations, lang, tld, slow, speed, upload_to_supabase, project_name):
+    """Yield one NDJSON line per synthesized scene, then a summary line"""
+    count = 0
+    try:
+        for rec in tts_service.iter_scene_audios(narrations, lang, tld, slow, speed):
+            line = {'scene_key': rec.key, 'audio': b64encode_str(rec.audio)}
+            if upload_to_supabase:
+                if rec.scene_number is None:
+                    line['supabase_url'] = None
+                else:
+                    path = f"{project_name}/scene_{rec.scene_number}.mp3"
+                    result = supabase_service.upload_file('audio', path, rec.audio, 'audio/mpeg')
+                    line['supabase_url'] = result['public_url'] if result['success'] else None
+            count += 1
+            yield orjson.dumps(line) + b'\n'
+        yield orjson.dumps({'success': True, 'count': count}) + b'\n'
+    except Exception as e:
+        # Headers are already sent, so report the failure in-band
+        logger.exception("Error in generate_all stream")
+        yield orjson.dumps({'success': False, 'count': count, 'error': str(e)}) + b'\n'
+
+
 @audio_bp.route('/estimate-duration', methods=['POST'])
 def estimate_duration():
     """
@@ -181,7 +238,7 @@ def estimate_duration():
         }
     """
     try:
-        data = request.get_json()
+        data = request.get_json(silent=True, cache=False)
         
         if not data or 'text' not in data:
             return jsonify({
@@ -200,7 +257,7 @@ def estimate_duration():
         }), 200
         
     except Exception as e:
-        logger.error(f"Error in estimate_duration: {str(e)}")
+        logger.exception("Error in estimate_duration")
         return jsonify({
             'success': False,
             'error': str(e)
@@ -5,22 +5,43 @@ Endpoints for comic image generation using Gemini
 
 import os
 import logging
-import base64
+import threading
+from typing import Optional
 from flask import Blueprint, request, jsonify
 from services.image_service import ImageService
 from services.supabase_service import supabase_service
+from utils.helpers import b64encode_str
+from utils.orjson_provider import json_response
 
 logger = logging.getLogger("VidyAI_Flask")
 
 image_bp = Blueprint('image', __name__)
 
+# Default negative concepts, built once and shared read-only by every request
+DEFAULT_NEGATIVE_CONCEPTS_SCENE = ('text', 'letters', 'watermark', 'logo')
+DEFAULT_NEGATIVE_CONCEPTS_ALL = ('text', 'letters', 'watermark', 'logo', 'caption', 'speech bubble', 'ui')
+
+
+# Shared across requests so the SDK client and its connection pool stay warm
+_image_service: Optional[ImageService] = None
+_image_service_lock = threading.Lock()
+
 
 def get_image_service():
-    """Get or create image service instance with API key"""
-    api_key = os.getenv('GEMINI_API_KEY')
-    if not api_key:
-        raise ValueError('GEMINI_API_KEY not found in environment variables')
-    return ImageService(api_key)
+    """Get or create the shared image service instance"""
+    global _image_service
+    if _image_service is None:
+        with _image_service_lock:
+            if _image_service is None:
+                api_key = os.getenv('GEMINI_API_KEY')
+                if not api_key:
+                    raise ValueError('GEMINI_API_KEY not found in environment variables')
+                service = ImageService(api_key)
+                # Don't pin a service whose client failed to initialize
+                if service.client is None:
+                    return service
+                _image_service = service
+    return _image_service
 
 
 @image_bp.route('/generate-scene', methods=['POST'])
@@ -46,7 +67,7 @@ def generate_scene():
         }
     """
     try:
-        data = request.get_json()
+        data = request.get_json(silent=True, cache=False)
         
         if not data or 'scene_prompt' not in data or 'scene_num' not in data:
             return jsonify({
@@ -58,7 +79,7 @@ def generate_scene():
         scene_num = data['scene_num']
         style_sheet = data.get('style_sheet', '')
         character_sheet = data.get('character_sheet', '')
-        negative_concepts = data.get('negative_concepts', ['text', 'letters', 'watermark', 'logo'])
+        negative_concepts = data.get('negative_concepts', DEFAULT_NEGATIVE_CONCEPTS_SCENE)
         aspect_ratio = data.get('aspect_ratio', '16:9')
         
         # Get image service
@@ -80,16 +101,16 @@ def generate_scene():
             }), 500
         
         # Convert to base64
-        image_base64 = base64.b64encode(image_data).decode('utf-8')
+        image_base64 = b64encode_str(image_data)
         
-        return jsonify({
+        return json_response({
             'success': True,
             'image': image_base64,
             'scene_num': scene_num
-        }), 200
+        }, 200)
         
     except Exception as e:
-        logger.error(f"Error in generate_scene: {str(e)}")
+        logger.exception("Error in generate_scene")
         return jsonify({
             'success': False,
             'error': str(e)
@@ -126,7 +147,7 @@ def generate_all():
         }
     """
     try:
-        data = request.get_json()
+        data = request.get_json(silent=True, cache=False)
         
         if not data or 'scene_prompts' not in data or 'title' not in data:
             return jsonify({
@@ -138,7 +159,7 @@ def generate_all():
         title = data['title']
         style_sheet = data.get('style_sheet', '')
         character_sheet = data.get('character_sheet', '')
-        negative_concepts = data.get('negative_concepts', ['text', 'letters', 'watermark', 'logo', 'caption', 'speech bubble', 'ui'])
+        negative_concepts = data.get('negative_concepts', DEFAULT_NEGATIVE_CONCEPTS_ALL)
         aspect_ratio = data.get('aspect_ratio', '16:9')
         image_quality = data.get('image_quality', 'high')
         lighting_style = data.get('lighting_style', 'natural')
@@ -171,12 +192,7 @@ def generate_all():
             }), 500
         
         # Convert to base64
-        images_base64 = []
-        for img in valid_images:
-            if img:
-                images_base64.append(base64.b64encode(img).decode('utf-8'))
-            else:
-                images_base64.append(None)
+        images_base64 = list(map(b64encode_str, valid_images))
         
         response = {
             'success': True,
@@ -186,24 +202,19 @@ def generate_all():
         
         # Upload to Supabase if requested
         if upload_to_supabase:
-            supabase_urls = []
-            for i, img_data in enumerate(valid_images, 1):
-                if img_data:
-                    path = f"{project_name}/scene_{i}.jpg"
-                    result = supabase_service.upload_file('images', path, img_data, 'image/jpeg')
-                    if result['success']:
-                        supabase_urls.append(result['public_url'])
-                    else:
-                        supabase_urls.append(None)
-                else:
-                    supabase_urls.append(None)
-            
-            response['supabase_urls'] = supabase_urls
-        
-        return jsonify(response), 200
+            results = supabase_service.upload_files([
+                ('images', f"{project_name}/scene_{i}.jpg", img_data, 'image/jpeg')
+                for i, img_data in enumerate(valid_images, 1)
+            ])
+            response['supabase_urls'] = [
+                result['public_url'] if result['success'] else None
+                for result in results
+            ]
+        
+        return json_response(response, 200)
         
     except Exception as e:
-        logger.error(f"Error in generate_all: {str(e)}")
+        logger.exception("Error in generate_all")
         return jsonify({
             'success': False,
             'error': str(e)
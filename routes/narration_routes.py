@@ -5,22 +5,35 @@ Endpoints for scene narration generation
 
 import os
 import logging
+import threading
+from typing import Optional
 from flask import Blueprint, request, jsonify
 from services.narration_service import NarrationService
 from services.supabase_service import supabase_service
 from utils.helpers import sanitize_filename
+from utils.orjson_provider import json_response
 
 logger = logging.getLogger("VidyAI_Flask")
 
 narration_bp = Blueprint('narration', __name__)
 
 
+# Shared across requests so the SDK client and its connection pool stay warm
+_narration_service: Optional[NarrationService] = None
+_narration_service_lock = threading.Lock()
+
+
 def get_narration_service():
-    """Get or create narration service instance with API key"""
-    api_key = os.getenv('GROQ_API_KEY')
-    if not api_key:
-        raise ValueError('GROQ_API_KEY not found in environment variables')
-    return NarrationService(api_key)
+    """Get or create the shared narration service instance"""
+    global _narration_service
+    if _narration_service is None:
+        with _narration_service_lock:
+            if _narration_service is None:
+                api_key = os.getenv('GROQ_API_KEY')
+                if not api_key:
+                    raise ValueError('GROQ_API_KEY not found in environment variables')
+                _narration_service = NarrationService(api_key)
+    return _narration_service
 
 
 @narration_bp.route('/generate-scene', methods=['POST'])
@@ -50,7 +63,7 @@ def generate_scene():
         }
     """
     try:
-        data = request.get_json()
+        data = request.get_json(silent=True, cache=False)
         
         if not data or 'title' not in data or 'scene_prompt' not in data or 'scene_number' not in data:
             return jsonify({
@@ -100,10 +113,10 @@ def generate_scene():
             except Exception as e:
                 logger.warning(f"Failed to upload narration text for scene {scene_number}: {e}")
         
-        return jsonify(response), 200
+        return json_response(response, 200)
         
     except Exception as e:
-        logger.error(f"Error in generate_scene: {str(e)}")
+        logger.exception("Error in generate_scene")
         return jsonify({
             'success': False,
             'error': str(e)
@@ -141,7 +154,7 @@ def generate_all():
         }
     """
     try:
-        data = request.get_json()
+        data = request.get_json(silent=True, cache=False)
         
         if not data or 'title' not in data or 'scene_prompts' not in data:
             return jsonify({
@@ -193,7 +206,8 @@ def generate_all():
         }
 
         if upload_to_supabase:
-            uploaded_paths = {}
+            scene_keys = []
+            jobs = []
             narrs = result.get('narrations', {})
             for scene_key, scene_data in narrs.items():
                 scene_num = scene_data.get('scene_number')
@@ -201,25 +215,23 @@ def generate_all():
                 if not narration_text:
                     continue
                 path = f"{project_name}/scene_{scene_num}_narration.txt"
-                try:
-                    upload_result = supabase_service.upload_file(
-                        'text',
-                        path,
-                        narration_text.encode('utf-8'),
-                        'text/plain'
-                    )
-                    uploaded_paths[scene_key] = {
-                        'path': path,
-                        'public_url': upload_result.get('public_url')
-                    }
-                except Exception as e:
-                    logger.warning(f"Failed to upload narration text for scene {scene_num}: {e}")
+                scene_keys.append(scene_key)
+                jobs.append(('text', path, narration_text.encode('utf-8'), 'text/plain'))
+            
+            uploaded_paths = {}
+            for scene_key, job, upload_result in zip(scene_keys, jobs, supabase_service.upload_files(jobs)):
+                if not upload_result['success']:
+                    logger.warning(f"Failed to upload narration text for {scene_key}: {upload_result.get('error')}")
+                uploaded_paths[scene_key] = {
+                    'path': job[1],
+                    'public_url': upload_result.get('public_url')
+                }
             response['subtitles_paths'] = uploaded_paths
         
-        return jsonify(response), 200
+        return json_response(response, 200)
         
     except Exception as e:
-        logger.error(f"Error in generate_all: {str(e)}")
+        logger.exception("Error in generate_all")
         return jsonify({
             'success': False,
             'error': str(e)
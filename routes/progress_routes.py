@@ -3,14 +3,25 @@ Progress API Routes
 Endpoints for tracking progress of long-running operations
 """
 
+import time
 import logging
-from flask import Blueprint, request, jsonify
+import orjson
+from flask import Blueprint, Response, request, jsonify
 from services.progress_service import progress_tracker
+from utils.orjson_provider import conditional_json_response
 
 logger = logging.getLogger("VidyAI_Flask")
 
 progress_bp = Blueprint('progress', __name__)
 
+# Upper bound on how long a single progress stream stays open (seconds)
+STREAM_MAX_SECONDS = 2400
+# Send an SSE comment when idle this long so proxies keep the connection open
+STREAM_KEEPALIVE_SECONDS = 15
+# Close a stream whose task is unknown or has not changed for this long, so a
+# failed or abandoned task cannot hold one of the worker's threads
+STREAM_IDLE_SECONDS = 60
+
 
 @progress_bp.route('/get', methods=['GET'])
 def get_progress():
@@ -20,6 +31,9 @@ def get_progress():
     Query Parameters:
         task_id: Task identifier (e.g., "images_Title" or "video_Title")
     
+    Request Headers:
+        If-None-Match: ETag from a previous poll; answered with 304 if unchanged
+    
     Response JSON:
         {
             "success": bool,
@@ -27,7 +41,7 @@ def get_progress():
             "message": str,
             "current": int,
             "total": int,
-            "error": str (if failed)
+            "error": str (if the request or the task failed)
         }
     """
     try:
@@ -50,22 +64,117 @@ def get_progress():
                 'total': 0
             }), 200
         
-        return jsonify({
+        payload = {
             'success': True,
             'progress': progress_data['progress'],
             'message': progress_data['message'],
             'current': progress_data['current'],
             'total': progress_data['total']
-        }), 200
+        }
+        if progress_data.get('error'):
+            payload['error'] = progress_data['error']
+        
+        # Content-hash ETag: unlike the tracker's version counter it stays
+        # valid across restarts, so an unchanged poll still gets a 304
+        return conditional_json_response(payload)
         
     except Exception as e:
-        logger.error(f"Error getting progress: {str(e)}")
+        logger.exception("Error getting progress")
         return jsonify({
             'success': False,
             'error': str(e)
         }), 500
 
 
+@progress_bp.route('/stream', methods=['GET'])
+def stream_progress():
+    """
+    Stream progress for a task as Server-Sent Events
+    
+    Pushes an event each time the task's progress changes instead of
+    requiring the client to poll /get. The stream closes after the event
+    where progress reaches 100 or an error is reported. An unknown,
+    cleared or stalled task (no change for STREAM_IDLE_SECONDS) ends the
+    stream with a final event carrying an error.
+    
+    Query Parameters:
+        task_id: Task identifier (e.g., "images_Title" or "video_Title")
+    
+    Event data JSON:
+        {
+            "progress": int (0-100),
+            "message": str,
+            "current": int,
+            "total": int,
+            "error": str (final event only, if the task failed, is unknown or stalled)
+        }
+    """
+    task_id = request.args.get('task_id')
+    
+    if not task_id:
+        return jsonify({
+            'success': False,
+            'error': 'task_id is required'
+        }), 400
+    
+    return Response(
+        _progress_events(task_id),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+
+def _progress_event(progress_data, error=None) -> bytes:
+    """Encode a progress snapshot (None for an unknown task) as one SSE event"""
+    if progress_data:
+        event = {
+            'progress': progress_data['progress'],
+            'message': progress_data['message'],
+            'current': progress_data['current'],
+            'total': progress_data['total']
+        }
+        error = error or progress_data.get('error')
+    else:
+        event = {'progress': 0, 'message': error or 'Task not found', 'current': 0, 'total': 0}
+    if error:
+        event['error'] = error
+    return b"data: " + orjson.dumps(event) + b"\n\n"
+
+
+def _progress_events(task_id: str):
+    """Yield an SSE event per progress change until the task completes, fails or stalls"""
+    now = time.monotonic()
+    deadline = now + STREAM_MAX_SECONDS
+    idle_deadline = now + STREAM_IDLE_SECONDS
+    last_timestamp = None
+    last_sent = now
+    
+    while time.monotonic() < deadline:
+        progress_data = progress_tracker.wait_for_update(task_id, last_timestamp, timeout=1.0)
+        timestamp = progress_data['timestamp'] if progress_data else None
+        now = time.monotonic()
+        
+        if timestamp != last_timestamp:
+            if progress_data is None:
+                yield _progress_event(None, 'Task cleared')
+                return
+            last_timestamp = timestamp
+            last_sent = now
+            idle_deadline = now + STREAM_IDLE_SECONDS
+            yield _progress_event(progress_data)
+            if progress_data['progress'] >= 100 or progress_data.get('error'):
+                return
+        elif now >= idle_deadline:
+            if progress_data is None:
+                yield _progress_event(None, 'Task not found')
+            else:
+                yield _progress_event(progress_data, f'No progress update in {STREAM_IDLE_SECONDS}s')
+            return
+        elif now - last_sent >= STREAM_KEEPALIVE_SECONDS:
+            last_sent = now
+            yield b": keepalive\n\n"
+
+
 @progress_bp.route('/clear', methods=['POST'])
 def clear_progress():
     """
@@ -83,7 +192,7 @@ def clear_progress():
         }
     """
     try:
-        data = request.get_json()
+        data = request.get_json(silent=True, cache=False)
         task_id = data.get('task_id') if data else None
         
         if not task_id:
@@ -99,7 +208,7 @@ def clear_progress():
         }), 200
         
     except Exception as e:
-        logger.error(f"Error clearing progress: {str(e)}")
+        logger.exception("Error clearing progress")
         return jsonify({
             'success': False,
             'error': str(e)
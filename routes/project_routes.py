@@ -5,6 +5,7 @@ API endpoints for project CRUD operations
 from flask import Blueprint, request, jsonify
 import logging
 from services.project_service import project_service
+from utils.orjson_provider import conditional_json_response
 
 logger = logging.getLogger("VidyAI_Flask")
 
@@ -12,7 +13,7 @@ logger = logging.getLogger("VidyAI_Flask")
 project_bp = Blueprint('projects', __name__, url_prefix='/api/projects')
 
 
-@project_bp.route('', methods=['GET', 'OPTIONS'])
+@project_bp.route('', methods=['GET'])
 def list_projects():
     """
     List all projects (videos from video bucket)
@@ -28,30 +29,13 @@ def list_projects():
             "count": 6
         }
     """
-    # Handle OPTIONS preflight request
-    if request.method == 'OPTIONS':
-        from flask import current_app
-        response = jsonify({})
-        origin = request.headers.get('Origin')
-        # Normalize origin by removing trailing slash for comparison
-        origin_normalized = origin.rstrip('/') if origin else None
-        cors_origins = current_app.config.get('CORS_ORIGINS', [])
-        logger.info(f"Projects OPTIONS - Origin: {origin}, Normalized: {origin_normalized}, Allowed: {cors_origins}")
-        
-        if origin_normalized and origin_normalized in cors_origins:
-            response.headers.add('Access-Control-Allow-Origin', origin)
-            response.headers.add('Access-Control-Allow-Methods', 'GET, POST, PUT, DELETE, OPTIONS, PATCH, HEAD')
-            response.headers.add('Access-Control-Allow-Headers', 'Content-Type, Authorization, X-Requested-With, Accept, Origin')
-            response.headers.add('Access-Control-Allow-Credentials', 'true')
-            response.headers.add('Access-Control-Max-Age', '3600')
-            logger.info(f"Projects OPTIONS response with CORS headers for origin: {origin}")
-        return response, 200
-    
     try:
         result = project_service.list_projects()
-        return jsonify(result), 200 if result.get('success') else 500
+        if not result.get('success'):
+            return jsonify(result), 500
+        return conditional_json_response(result)
     except Exception as e:
-        logger.error(f"Error in list_projects: {e}")
+        logger.exception("Error in list_projects")
         return jsonify({
             'success': False,
             'error': str(e)
@@ -82,7 +66,7 @@ def create_project():
         }
     """
     try:
-        data = request.get_json()
+        data = request.get_json(silent=True, cache=False)
         
         if not data or not data.get('title'):
             return jsonify({
@@ -94,7 +78,7 @@ def create_project():
         return jsonify(result), 201 if result.get('success') else 500
         
     except Exception as e:
-        logger.error(f"Error in create_project: {e}")
+        logger.exception("Error in create_project")
         return jsonify({
             'success': False,
             'error': str(e)
@@ -116,10 +100,12 @@ def get_project(project_id):
     """
     try:
         result = project_service.get_project(project_id)
-        return jsonify(result), 200 if result.get('success') else 404
+        if not result.get('success'):
+            return jsonify(result), 404
+        return conditional_json_response(result)
         
     except Exception as e:
-        logger.error(f"Error in get_project: {e}")
+        logger.exception("Error in get_project")
         return jsonify({
             'success': False,
             'error': str(e)
@@ -147,7 +133,7 @@ def update_project(project_id):
         }
     """
     try:
-        data = request.get_json()
+        data = request.get_json(silent=True, cache=False)
         
         if not data:
             return jsonify({
@@ -159,7 +145,7 @@ def update_project(project_id):
         return jsonify(result), 200 if result.get('success') else 500
         
     except Exception as e:
-        logger.error(f"Error in update_project: {e}")
+        logger.exception("Error in update_project")
         return jsonify({
             'success': False,
             'error': str(e)
@@ -184,7 +170,7 @@ def delete_project(project_id):
         return jsonify(result), 200 if result.get('success') else 500
         
     except Exception as e:
-        logger.error(f"Error in delete_project: {e}")
+        logger.exception("Error in delete_project")
         return jsonify({
             'success': False,
             'error': str(e)
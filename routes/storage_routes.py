@@ -4,22 +4,119 @@ Endpoints for Supabase Storage operations
 """
 
 import os
+import gzip
+import binascii
 import logging
-import base64
-from flask import Blueprint, request, jsonify
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Tuple
+from urllib.parse import quote
+from flask import Blueprint, Response, current_app, request, jsonify
 from services.supabase_service import supabase_service
 from services.project_service import project_service
+from services.response_cache import response_cache
+from services.upload_jobs import upload_jobs
+from utils.helpers import b64encode_str, b64decode, get_content_type
+from utils.validation import validate_base64
+from utils.orjson_provider import json_bytes, conditional_json_response
+from utils.schemas import StorageUploadRequest, StoragePathRequest, StorageSignedUrlRequest, StorageListRequest, decode_request
 
 logger = logging.getLogger("VidyAI_Flask")
 
+# Brotli ships with flask-compress; fall back to gzip-only if it is missing
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
 storage_bp = Blueprint('storage', __name__)
 
+# Longest base64 file_data accepted by /upload (characters, ~24MB decoded). Kept
+# well under MAX_CONTENT_LENGTH; larger files go multipart, raw or signed URL
+MAX_UPLOAD_B64_LENGTH = int(os.getenv('MAX_UPLOAD_B64_LENGTH', 32 * 1024 * 1024))
+
+# Concurrent folder listings when walking a bucket
+LIST_MAX_WORKERS = 16
+
+# File extensions treated as images when picking project thumbnails
+IMAGE_EXTENSIONS = frozenset({'jpg', 'jpeg', 'png', 'webp', 'gif'})
+
+# A public URL is derived from bucket + path alone, so it never changes
+GET_URL_CACHE_CONTROL = 'public, max-age=3600, immutable'
+
+# Last video count served, kept past cache expiry so a recount never blocks
+# a request once one has succeeded (see get_video_count)
+_last_video_count: Optional[int] = None
+_video_count_refresh_lock = threading.Lock()
+
+
+def _compress_body(body: bytes, encoding: str) -> bytes:
+    """Compress a response body at a high level (done once per cache entry)"""
+    if encoding == 'br':
+        return brotli.compress(body, quality=9)
+    return gzip.compress(body, compresslevel=9)
+
+
+def _cached_json_response(body: bytes, etag: str, cache_key: str):
+    """
+    JSON response for a cached, already-serialized body, tagged with its ETag
+    
+    When the client accepts brotli or gzip, the body is compressed once per
+    cache entry and reused, instead of being recompressed on every request.
+    """
+    accepted = request.accept_encodings
+    encoding = 'br' if brotli is not None and accepted['br'] else 'gzip' if accepted['gzip'] else None
+    
+    compressed = None
+    if encoding is not None:
+        compressed = response_cache.variant(cache_key, etag, encoding, lambda: _compress_body(body, encoding))
+    
+    if compressed is None:
+        response = Response(body, status=200, mimetype='application/json')
+    else:
+        response = Response(compressed, status=200, mimetype='application/json')
+        response.headers['Content-Encoding'] = encoding
+        response.vary.add('Accept-Encoding')
+    response.headers['ETag'] = etag
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+
+def _thumbnail_urls(bucket_name: str, first_images):
+    """Map each project folder to the public URL of its first image"""
+    prefix = supabase_service.public_url_prefix(bucket_name)
+    return {
+        project_folder: prefix + quote(image_path, safe='/')
+        for project_folder, image_path in first_images.items()
+    }
+
+
+def _cache_lookup(cache_key: str):
+    """Response for a fresh cache entry (304 if the client's ETag matches), or None"""
+    cached = response_cache.get(cache_key)
+    if cached is None:
+        return None
+    etag, body = cached
+    if request.headers.get('If-None-Match') == etag:
+        return Response(status=304, headers={'ETag': etag})
+    return _cached_json_response(body, etag, cache_key)
+
+
+def _cache_and_respond(cache_key: str, bucket_name: str, payload):
+    """Serialize a freshly computed payload, cache it for bucket_name and return it"""
+    body = json_bytes(payload)
+    return _cached_json_response(body, response_cache.put(cache_key, bucket_name, body), cache_key)
+
 
 @storage_bp.route('/upload', methods=['POST'])
 def upload_file():
     """
     Upload a file to Supabase Storage
     
+    The base64 JSON form is kept for existing clients; large files should use
+    multipart/form-data here, the raw body of /upload-raw, or upload straight
+    to storage through /upload-signed-url instead.
+    
     Request JSON:
         {
             "bucket": str (images, audio, video, metadata, text),
@@ -28,6 +125,119 @@ def upload_file():
             "content_type": str (optional)
         }
     
+    Request multipart/form-data (alternative, no base64 overhead):
+        file: the file itself
+        bucket: str
+        path: str
+        content_type: str (optional, defaults to the part's Content-Type)
+    
+    Query Parameters:
+        background: "true" to queue the upload and return 202 with a job_id
+                    immediately (poll /upload/status/<job_id> for the result);
+                    503 if UPLOAD_MAX_PENDING uploads are already queued
+    
+    Response JSON:
+        {
+            "success": bool,
+            "bucket": str,
+            "path": str,
+            "public_url": str or null,
+            "job_id": str (background uploads only),
+            "error": str (if failed)
+        }
+    """
+    try:
+        if 'file' in request.files:
+            # Multipart upload: raw bytes, no base64 decode
+            form = request.form
+            if 'bucket' not in form or 'path' not in form:
+                return jsonify({
+                    'success': False,
+                    'error': 'bucket and path are required'
+                }), 400
+            
+            upload = request.files['file']
+            bucket = form['bucket']
+            path = form['path']
+            content_type = form.get('content_type') or upload.mimetype or None
+            file_data = upload.read()
+        else:
+            data, error = decode_request(request.get_data(cache=False), StorageUploadRequest)
+            
+            if error:
+                return jsonify({
+                    'success': False,
+                    'error': error
+                }), 400
+            
+            # Reject oversized or malformed payloads before allocating the decoded bytes
+            if len(data.file_data) > MAX_UPLOAD_B64_LENGTH:
+                return jsonify({
+                    'success': False,
+                    'error': f'file_data exceeds {MAX_UPLOAD_B64_LENGTH} base64 characters'
+                }), 400
+            
+            if not validate_base64(data.file_data):
+                return jsonify({
+                    'success': False,
+                    'error': 'file_data must be base64 encoded'
+                }), 400
+            
+            bucket = data.bucket
+            path = data.path
+            content_type = data.content_type
+            
+            # Decode file data
+            try:
+                file_data = b64decode(data.file_data)
+            except (binascii.Error, ValueError) as e:
+                return jsonify({
+                    'success': False,
+                    'error': f'file_data must be base64 encoded: {e}'
+                }), 400
+        
+        if request.args.get('background') == 'true':
+            job_id = upload_jobs.submit(bucket, path, file_data, content_type)
+            if job_id is None:
+                response = jsonify({
+                    'success': False,
+                    'error': 'Too many background uploads in progress, retry later'
+                })
+                response.headers['Retry-After'] = '5'
+                return response, 503
+            return jsonify({
+                'success': True,
+                'job_id': job_id,
+                'bucket': bucket,
+                'path': path
+            }), 202
+        
+        # Upload to Supabase
+        result = supabase_service.upload_file(bucket, path, file_data, content_type)
+        
+        return jsonify(result), 200 if result['success'] else 500
+        
+    except Exception as e:
+        logger.exception("Error in upload_file")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@storage_bp.route('/upload-raw', methods=['POST'])
+def upload_raw():
+    """
+    Upload a file sent as the raw request body (no JSON, no base64)
+    
+    Query Parameters (or headers X-Bucket / X-Path):
+        bucket: str (images, audio, video, metadata, text)
+        path: str (file path in bucket)
+        content_type: str (optional, defaults to the request Content-Type)
+    
+    Body:
+        The file bytes (e.g. Content-Type: image/jpeg)
+    
     Response JSON:
         {
             "success": bool,
@@ -38,29 +248,117 @@ def upload_file():
         }
     """
     try:
-        data = request.get_json()
+        bucket = request.args.get('bucket') or request.headers.get('X-Bucket')
+        path = request.args.get('path') or request.headers.get('X-Path')
         
-        if not data or 'bucket' not in data or 'path' not in data or 'file_data' not in data:
+        if not bucket or not path:
             return jsonify({
                 'success': False,
-                'error': 'bucket, path, and file_data are required'
+                'error': 'bucket and path are required'
             }), 400
         
-        bucket = data['bucket']
-        path = data['path']
-        file_data_base64 = data['file_data']
-        content_type = data.get('content_type')
+        content_type = request.args.get('content_type') or request.mimetype or None
         
-        # Decode file data
-        file_data = base64.b64decode(file_data_base64)
+        # Read the body once, bounded by MAX_CONTENT_LENGTH, without caching it
+        file_data = request.get_data(cache=False)
+        if not file_data:
+            return jsonify({
+                'success': False,
+                'error': 'Request body is empty'
+            }), 400
         
-        # Upload to Supabase
         result = supabase_service.upload_file(bucket, path, file_data, content_type)
         
         return jsonify(result), 200 if result['success'] else 500
         
     except Exception as e:
-        logger.error(f"Error in upload_file: {str(e)}")
+        logger.exception("Error in upload_raw")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@storage_bp.route('/upload/status/<job_id>', methods=['GET'])
+def upload_status(job_id):
+    """
+    Get the status of a background upload
+    
+    Response JSON:
+        {
+            "success": bool,
+            "status": str ("pending", "completed", "failed"),
+            "bucket": str,
+            "path": str,
+            "result": dict or null (upload result once finished),
+            "error": str (if failed)
+        }
+    """
+    job = upload_jobs.get_status(job_id)
+    
+    if job is None:
+        return jsonify({
+            'success': False,
+            'error': 'Unknown or expired job_id'
+        }), 404
+    
+    return jsonify({
+        'success': True,
+        'status': job['status'],
+        'bucket': job['bucket'],
+        'path': job['path'],
+        'result': job['result']
+    }), 200
+
+
+@storage_bp.route('/upload-signed-url', methods=['POST'])
+def upload_signed_url():
+    """
+    Get a signed URL to upload a file directly to storage
+    
+    The client PUTs the raw file to the returned URL, so the file never passes
+    through this server. Supabase signed upload URLs are valid for two hours.
+    
+    Request JSON:
+        {
+            "bucket": str,
+            "path": str
+        }
+    
+    Response JSON:
+        {
+            "success": bool,
+            "url": str or null,
+            "token": str or null,
+            "path": str,
+            "public_url": str or null (where the file will be served once uploaded),
+            "error": str (if failed)
+        }
+    """
+    try:
+        data, error = decode_request(request.get_data(cache=False), StoragePathRequest)
+        
+        if error:
+            return jsonify({
+                'success': False,
+                'error': error
+            }), 400
+        
+        signed = supabase_service.create_signed_upload_url(data.bucket, data.path)
+        
+        if not signed or not signed['url']:
+            return jsonify({
+                'success': False,
+                'error': 'Failed to create signed upload URL'
+            }), 500
+        
+        return jsonify({
+            'success': True,
+            **signed
+        }), 200
+        
+    except Exception as e:
+        logger.exception("Error in upload_signed_url")
         return jsonify({
             'success': False,
             'error': str(e)
@@ -72,6 +370,10 @@ def download_file():
     """
     Download a file from Supabase Storage
     
+    Query Parameters:
+        format: "binary" to receive the file itself (with its MIME type)
+                instead of base64 JSON
+    
     Request JSON:
         {
             "bucket": str,
@@ -86,16 +388,16 @@ def download_file():
         }
     """
     try:
-        data = request.get_json()
+        data, error = decode_request(request.get_data(cache=False), StoragePathRequest)
         
-        if not data or 'bucket' not in data or 'path' not in data:
+        if error:
             return jsonify({
                 'success': False,
-                'error': 'bucket and path are required'
+                'error': error
             }), 400
         
-        bucket = data['bucket']
-        path = data['path']
+        bucket = data.bucket
+        path = data.path
         
         # Download from Supabase
         result = supabase_service.download_file(bucket, path)
@@ -103,8 +405,15 @@ def download_file():
         if not result.get('success'):
             return jsonify(result), 404
         
+        if request.args.get('format') == 'binary':
+            return Response(
+                result['file_data'],
+                mimetype=get_content_type(path),
+                headers={'Content-Disposition': f'inline; filename="{os.path.basename(path)}"'}
+            )
+        
         # Encode to base64
-        file_data_base64 = base64.b64encode(result['file_data']).decode('utf-8')
+        file_data_base64 = b64encode_str(result['file_data'])
         
         return jsonify({
             'success': True,
@@ -112,7 +421,67 @@ def download_file():
         }), 200
         
     except Exception as e:
-        logger.error(f"Error in download_file: {str(e)}")
+        logger.exception("Error in download_file")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@storage_bp.route('/download-url', methods=['POST'])
+def download_url():
+    """
+    Get a short-lived signed URL to download a file directly from storage
+    
+    Lets the client fetch the file itself instead of receiving it base64
+    encoded through /download.
+    
+    Request JSON:
+        {
+            "bucket": str,
+            "path": str,
+            "expires_in": int (optional, seconds, default: 300)
+        }
+    
+    Response JSON:
+        {
+            "success": bool,
+            "url": str or null,
+            "expires_in": int,
+            "error": str (if failed)
+        }
+    """
+    try:
+        data, error = decode_request(request.get_data(cache=False), StorageSignedUrlRequest)
+        
+        if error:
+            return jsonify({
+                'success': False,
+                'error': error
+            }), 400
+        
+        if data.expires_in <= 0:
+            return jsonify({
+                'success': False,
+                'error': 'expires_in must be positive'
+            }), 400
+        
+        url = supabase_service.create_signed_url(data.bucket, data.path, data.expires_in)
+        
+        if not url:
+            return jsonify({
+                'success': False,
+                'error': 'Failed to create signed URL'
+            }), 500
+        
+        return jsonify({
+            'success': True,
+            'url': url,
+            'expires_in': data.expires_in
+        }), 200
+        
+    except Exception as e:
+        logger.exception("Error in download_url")
         return jsonify({
             'success': False,
             'error': str(e)
@@ -139,16 +508,16 @@ def delete_file():
         }
     """
     try:
-        data = request.get_json()
+        data, error = decode_request(request.get_data(cache=False), StoragePathRequest)
         
-        if not data or 'bucket' not in data or 'path' not in data:
+        if error:
             return jsonify({
                 'success': False,
-                'error': 'bucket and path are required'
+                'error': error
             }), 400
         
-        bucket = data['bucket']
-        path = data['path']
+        bucket = data.bucket
+        path = data.path
         
         # Delete from Supabase
         result = supabase_service.delete_file(bucket, path)
@@ -156,7 +525,7 @@ def delete_file():
         return jsonify(result), 200 if result['success'] else 500
         
     except Exception as e:
-        logger.error(f"Error in delete_file: {str(e)}")
+        logger.exception("Error in delete_file")
         return jsonify({
             'success': False,
             'error': str(e)
@@ -183,16 +552,16 @@ def list_files():
         }
     """
     try:
-        data = request.get_json()
+        data, error = decode_request(request.get_data(cache=False), StorageListRequest)
         
-        if not data or 'bucket' not in data:
+        if error:
             return jsonify({
                 'success': False,
-                'error': 'bucket is required'
+                'error': error
             }), 400
         
-        bucket = data['bucket']
-        path = data.get('path', '')
+        bucket = data.bucket
+        path = data.path
         
         # List files from Supabase
         result = supabase_service.list_files(bucket, path)
@@ -200,19 +569,26 @@ def list_files():
         return jsonify(result), 200 if result.get('success') else 500
         
     except Exception as e:
-        logger.error(f"Error in list_files: {str(e)}")
+        logger.exception("Error in list_files")
         return jsonify({
             'success': False,
             'error': str(e)
         }), 500
 
 
-@storage_bp.route('/get-url', methods=['POST'])
+@storage_bp.route('/get-url', methods=['GET', 'POST'])
 def get_public_url():
     """
     Get public URL for a file
     
-    Request JSON:
+    GET responses are cacheable by the browser (Cache-Control: public,
+    immutable); POST is kept for existing clients.
+    
+    Query Parameters (GET):
+        bucket: Bucket name
+        path: File path in bucket
+    
+    Request JSON (POST):
         {
             "bucket": str,
             "path": str
@@ -226,17 +602,24 @@ def get_public_url():
         }
     """
     try:
-        data = request.get_json()
-        
-        if not data or 'bucket' not in data or 'path' not in data:
+        if request.method == 'GET':
+            bucket = request.args.get('bucket')
+            path = request.args.get('path')
+        else:
+            data, error = decode_request(request.get_data(cache=False), StoragePathRequest)
+            if error:
+                return jsonify({
+                    'success': False,
+                    'error': error
+                }), 400
+            bucket, path = data.bucket, data.path
+        
+        if not bucket or not path:
             return jsonify({
                 'success': False,
                 'error': 'bucket and path are required'
             }), 400
         
-        bucket = data['bucket']
-        path = data['path']
-        
         # Get public URL
         public_url = supabase_service.get_public_url(bucket, path)
         
@@ -246,13 +629,15 @@ def get_public_url():
                 'error': 'Failed to get public URL'
             }), 500
         
-        return jsonify({
+        response = jsonify({
             'success': True,
             'public_url': public_url
-        }), 200
+        })
+        response.headers['Cache-Control'] = GET_URL_CACHE_CONTROL
+        return response, 200
         
     except Exception as e:
-        logger.error(f"Error in get_public_url: {str(e)}")
+        logger.exception("Error in get_public_url")
         return jsonify({
             'success': False,
             'error': str(e)
@@ -264,6 +649,8 @@ def list_projects():
     """
     List all projects (folders) in images bucket
     
+    Cached like /get-all-thumbnails (ETag / If-None-Match supported).
+    
     Response JSON:
         {
             "success": bool,
@@ -273,6 +660,13 @@ def list_projects():
         }
     """
     try:
+        bucket_name = supabase_service.buckets.get('images', 'images')
+        cache_key = f"list-projects:{bucket_name}"
+        
+        cached_response = _cache_lookup(cache_key)
+        if cached_response is not None:
+            return cached_response
+        
         result = supabase_service.list_files('images', '')
         if not result.get('success'):
             return jsonify({
@@ -283,34 +677,70 @@ def list_projects():
             }), 500
 
         files = result.get('files', [])
-        projects = {
-            name.split('/')[0]
-            for name in [f.get('name', '') for f in files]
-            if name and '/' in name
-        }
-
-        projects_list = sorted(projects)
+        projects_list = sorted({
+            name.split('/', 1)[0]
+            for f in files
+            if '/' in (name := f.get('name') or '')
+        })
 
-        return jsonify({
+        return _cache_and_respond(cache_key, bucket_name, {
             'success': True,
             'projects': projects_list,
             'count': len(projects_list)
-        }), 200
+        })
         
     except Exception as e:
-        logger.error(f"Error in list_projects: {str(e)}")
+        logger.exception("Error in list_projects")
         return jsonify({
             'success': False,
             'error': str(e)
         }), 500
 
 
+def _count_videos(cache_key: str, bucket_name: str) -> Tuple[bytes, str]:
+    """Count video projects and cache the response body; returns (body, etag)"""
+    global _last_video_count
+    
+    # Use project service which already successfully lists videos from video bucket
+    # Each video project corresponds to one folder in the video bucket
+    result = project_service.list_projects()
+    
+    if not result.get('success'):
+        raise RuntimeError(result.get('error', 'Failed to get video count'))
+    
+    video_count = result.get('count', 0)
+    logger.info("Video count from project service: %d", video_count)
+    _last_video_count = video_count
+    body = json_bytes({'success': True, 'count': video_count})
+    return body, response_cache.put(cache_key, bucket_name, body)
+
+
+def _recount_videos_in_background(cache_key: str, bucket_name: str):
+    """Start a recount unless one is already running"""
+    if not _video_count_refresh_lock.acquire(blocking=False):
+        return
+    
+    def run():
+        try:
+            _count_videos(cache_key, bucket_name)
+        except Exception:
+            logger.exception("Error refreshing video count")
+        finally:
+            _video_count_refresh_lock.release()
+    
+    threading.Thread(target=run, name="video-count-refresh", daemon=True).start()
+
+
 @storage_bp.route('/get-video-count', methods=['GET'])
 def get_video_count():
     """
     Get count of video folders (projects) in the video bucket
     Simple logic: use project service count (each video = one folder/project)
     
+    Cached like /get-all-thumbnails (ETag / If-None-Match supported). Once a
+    count has been computed, an expired or invalidated entry is answered with
+    the last count straight away while a background thread recounts.
+    
     Response JSON:
         {
             "success": bool,
@@ -319,27 +749,26 @@ def get_video_count():
         }
     """
     try:
-        # Use project service which already successfully lists videos from video bucket
-        # Each video project corresponds to one folder in the video bucket
-        result = project_service.list_projects()
+        bucket_name = supabase_service.buckets.get('video', 'video')
+        cache_key = f"video-count:{bucket_name}"
         
-        if result.get('success'):
-            video_count = result.get('count', 0)
-            logger.info(f"Video count from project service: {video_count}")
-            return jsonify({
+        cached_response = _cache_lookup(cache_key)
+        if cached_response is not None:
+            return cached_response
+        
+        if _last_video_count is not None:
+            _recount_videos_in_background(cache_key, bucket_name)
+            # Same body, and so the same content-hash ETag, as a cached count
+            return conditional_json_response({
                 'success': True,
-                'count': video_count
-            }), 200
-        else:
-            logger.error(f"Project service returned error: {result.get('error')}")
-            return jsonify({
-                'success': False,
-                'error': result.get('error', 'Failed to get video count'),
-                'count': 0
-            }), 500
+                'count': _last_video_count
+            })
+        
+        body, etag = _count_videos(cache_key, bucket_name)
+        return _cached_json_response(body, etag, cache_key)
         
     except Exception as e:
-        logger.error(f"Error getting video count: {str(e)}", exc_info=True)
+        logger.exception("Error getting video count")
         return jsonify({
             'success': False,
             'error': str(e),
@@ -352,6 +781,15 @@ def get_all_thumbnails():
     """
     Get thumbnails for all projects in images bucket in a single optimized call
     
+    Results are cached for RESPONSE_CACHE_TTL seconds (until the next upload
+    or delete in the images bucket).
+    
+    Query Parameters:
+        debug: "true" to include the debug block outside debug mode
+    
+    Request Headers:
+        If-None-Match: ETag from a previous call; answered with 304 if unchanged
+    
     Response JSON:
         {
             "success": bool,
@@ -360,21 +798,50 @@ def get_all_thumbnails():
                 ...
             },
             "count": int,
+            "debug": dict (only in debug mode or with ?debug=true),
             "error": str (if failed)
         }
     """
     try:
         bucket_name = supabase_service.buckets.get('images', 'images')
-        
-        # List all files in images bucket recursively
-        def list_all_files_recursive(path=""):
-            """Recursively list all files in the bucket"""
-            all_files = []
+        include_debug = current_app.debug or request.args.get('debug') == 'true'
+        # Debug responses are cached apart so the lean body stays lean
+        cache_key = f"thumbnails:{bucket_name}:debug" if include_debug else f"thumbnails:{bucket_name}"
+        
+        cached_response = _cache_lookup(cache_key)
+        if cached_response is not None:
+            return cached_response
+        
+        # Fast path: one SQL query returns the first image of every project
+        first_images = supabase_service.first_image_per_folder(bucket_name)
+        if first_images is not None:
+            thumbnails = _thumbnail_urls(bucket_name, first_images)
+            
+            logger.info("Returning %d thumbnails from SQL lookup", len(thumbnails))
+            
+            payload = {
+                'success': True,
+                'thumbnails': thumbnails,
+                'count': len(thumbnails)
+            }
+            if include_debug:
+                payload['debug'] = {
+                    'total_files': None,
+                    'project_folders': list(first_images.keys()),
+                    'thumbnail_keys': list(thumbnails.keys())
+                }
+            return _cache_and_respond(cache_key, bucket_name, payload)
+        
+        def list_folder(path):
+            """List one folder, returning (file paths, file MIME types, subfolder paths)"""
+            paths = []
+            mime_types = []
+            subfolders = []
             try:
-                items = supabase_service.client.storage.from_(bucket_name).list(path=path)
+                items = supabase_service.bucket(bucket_name).list(path=path)
                 
                 if items is None:
-                    return all_files
+                    return paths, mime_types, subfolders
                 
                 for item in items:
                     if item is None:
@@ -390,79 +857,78 @@ def get_all_thumbnails():
                     is_folder = metadata is None
                     
                     if is_folder:
-                        # It's a folder - recurse into it
-                        all_files.extend(list_all_files_recursive(full_path))
+                        # It's a folder - list it in the next wave
+                        subfolders.append(full_path)
                     else:
                         # It's a file - add it
-                        all_files.append({
-                            'name': name,
-                            'path': full_path,
-                            'mime_type': metadata.get('mimetype') if metadata else None
-                        })
+                        paths.append(full_path)
+                        mime_types.append(metadata.get('mimetype'))
             except Exception as e:
-                logger.warning(f"Error listing files at {path}: {e}")
+                logger.warning("Error listing files at %s: %s", path, e)
             
-            return all_files
-        
-        # Get all files
-        all_files = list_all_files_recursive()
-        logger.info(f"Found {len(all_files)} total files in images bucket")
-        
-        # Group files by project folder and find first image for each
-        thumbnails = {}
-        project_files = {}
-        
-        for file_info in all_files:
-            path = file_info['path']
-            if '/' in path:
-                project_folder = path.split('/')[0]
-                file_name = path.split('/', 1)[1]
-                
-                # Check if it's an image file
-                mime_type = file_info.get('mime_type', '').lower()
-                name_lower = file_name.lower()
-                
-                is_image = (
-                    mime_type.startswith('image/') or
-                    name_lower.endswith(('.jpg', '.jpeg', '.png', '.webp', '.gif'))
-                )
-                
-                if is_image:
-                    if project_folder not in project_files:
-                        project_files[project_folder] = []
-                    project_files[project_folder].append(path)
+            return paths, mime_types, subfolders
+        
+        # Walk the bucket breadth-first, listing each level's folders concurrently.
+        # Files are kept as parallel path / MIME type lists (no per-file object).
+        all_paths = []
+        all_mime_types = []
+        pending = [""]
+        with ThreadPoolExecutor(max_workers=LIST_MAX_WORKERS) as executor:
+            while pending:
+                next_pending = []
+                for paths, mime_types, subfolders in executor.map(list_folder, pending):
+                    all_paths.extend(paths)
+                    all_mime_types.extend(mime_types)
+                    next_pending.extend(subfolders)
+                pending = next_pending
+        
+        logger.info("Found %d total files in images bucket", len(all_paths))
+        
+        # Find the first image (lowest path, e.g. scene_1.jpg) of each project folder
+        first_images = {}
+        
+        for path, mime_type in zip(all_paths, all_mime_types):
+            separator = path.find('/')
+            if separator < 0:
+                continue
+            
+            # Check if it's an image file. The extension of the full path is the
+            # file's own extension (a dot in a folder name leaves a '/' after it),
+            # so the file name is never sliced out. It is checked first since it
+            # settles nearly every file without looking at the MIME type.
+            if not (
+                path.rpartition('.')[2].lower() in IMAGE_EXTENSIONS or
+                (mime_type or '').lower().startswith('image/')
+            ):
+                continue
+            
+            project_folder = path[:separator]
+            current = first_images.get(project_folder)
+            if current is None or path < current:
+                first_images[project_folder] = path
         
-        logger.info(f"Found {len(project_files)} project folders with images: {list(project_files.keys())}")
+        logger.debug("Found %d project folders with images: %s", len(first_images), first_images.keys())
         
         # Get public URL for first image of each project
-        for project_folder, file_paths in project_files.items():
-            if file_paths:
-                # Sort to get consistent first image (scene_1.jpg typically)
-                file_paths.sort()
-                first_image_path = file_paths[0]
-                
-                try:
-                    public_url = supabase_service.client.storage.from_(bucket_name).get_public_url(first_image_path)
-                    thumbnails[project_folder] = public_url
-                    logger.info(f"Added thumbnail for project folder: {project_folder}")
-                except Exception as e:
-                    logger.warning(f"Failed to get public URL for {first_image_path}: {e}")
+        thumbnails = _thumbnail_urls(bucket_name, first_images)
         
-        logger.info(f"Returning {len(thumbnails)} thumbnails: {list(thumbnails.keys())}")
+        logger.info("Returning %d thumbnails", len(thumbnails))
         
-        return jsonify({
+        payload = {
             'success': True,
             'thumbnails': thumbnails,
-            'count': len(thumbnails),
-            'debug': {
-                'total_files': len(all_files),
-                'project_folders': list(project_files.keys()),
+            'count': len(thumbnails)
+        }
+        if include_debug:
+            payload['debug'] = {
+                'total_files': len(all_paths),
+                'project_folders': list(first_images.keys()),
                 'thumbnail_keys': list(thumbnails.keys())
             }
-        }), 200
+        return _cache_and_respond(cache_key, bucket_name, payload)
         
     except Exception as e:
-        logger.error(f"Error in get_all_thumbnails: {str(e)}")
+        logger.exception("Error in get_all_thumbnails")
         return jsonify({
             'success': False,
             'error': str(e),
@@ -5,20 +5,45 @@ Endpoints for storyline and scene prompt generation
 
 import os
 import logging
-from flask import Blueprint, request, jsonify
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+from flask import Blueprint, Response, request, jsonify
 from services.story_service import StoryService
+from utils.orjson_provider import json_bytes, json_response
+from utils.schemas import (
+    StorylineRequest,
+    ScenePromptsRequest,
+    CompleteStoryRequest,
+    CompleteStoryBatchRequest,
+    decode_request
+)
 
 logger = logging.getLogger("VidyAI_Flask")
 
 story_bp = Blueprint('story', __name__)
 
+# Stories in a batch are independent Groq calls; cap how many run at once
+BATCH_MAX_WORKERS = 4
+BATCH_MAX_ITEMS = 20
+
+
+# Shared across requests so the SDK client and its connection pool stay warm
+_story_service: Optional[StoryService] = None
+_story_service_lock = threading.Lock()
+
 
 def get_story_service():
-    """Get or create story service instance with API key"""
-    api_key = os.getenv('GROQ_API_KEY')
-    if not api_key:
-        raise ValueError('GROQ_API_KEY not found in environment variables')
-    return StoryService(api_key)
+    """Get or create the shared story service instance"""
+    global _story_service
+    if _story_service is None:
+        with _story_service_lock:
+            if _story_service is None:
+                api_key = os.getenv('GROQ_API_KEY')
+                if not api_key:
+                    raise ValueError('GROQ_API_KEY not found in environment variables')
+                _story_service = StoryService(api_key)
+    return _story_service
 
 
 @story_bp.route('/generate-storyline', methods=['POST'])
@@ -49,50 +74,36 @@ def generate_storyline():
         }
     """
     try:
-        data = request.get_json()
+        data, error = decode_request(request.get_data(cache=False), StorylineRequest)
         
-        if not data or 'title' not in data or 'content' not in data:
+        if error:
             return jsonify({
                 'success': False,
-                'error': 'Title and content are required'
+                'error': error
             }), 400
         
-        title = data['title']
-        content = data['content']
-        target_length = data.get('target_length', 'medium')
-        max_chars = data.get('max_chars', 25000)
-        
-        # Extract customization options
-        tone = data.get('tone', 'casual')
-        target_audience = data.get('target_audience', 'general')
-        complexity = data.get('complexity', 'moderate')
-        focus_style = data.get('focus_style', 'comprehensive')
-        scene_count = data.get('scene_count')
-        educational_level = data.get('educational_level', 'intermediate')
-        visual_style = data.get('visual_style', 'educational')
-        
         # Get story service
         story_service = get_story_service()
         
         # Generate storyline with all customization options
         storyline = story_service.generate_comic_storyline(
-            title=title,
-            content=content,
-            target_length=target_length,
-            max_chars=max_chars,
-            tone=tone,
-            target_audience=target_audience,
-            complexity=complexity,
-            focus_style=focus_style,
-            scene_count=scene_count,
-            educational_level=educational_level,
-            visual_style=visual_style
+            title=data.title,
+            content=data.content,
+            target_length=data.target_length,
+            max_chars=data.max_chars,
+            tone=data.tone,
+            target_audience=data.target_audience,
+            complexity=data.complexity,
+            focus_style=data.focus_style,
+            scene_count=data.scene_count,
+            educational_level=data.educational_level,
+            visual_style=data.visual_style
         )
         
-        return jsonify({
+        return json_response({
             'success': True,
             'storyline': storyline
-        }), 200
+        }, 200)
         
     except Exception as e:
         logger.error(f"Error in generate_storyline: {str(e)}")
@@ -133,53 +144,39 @@ def generate_scenes():
         }
     """
     try:
-        data = request.get_json()
+        data, error = decode_request(request.get_data(cache=False), ScenePromptsRequest)
         
-        if not data or 'title' not in data or 'storyline' not in data:
+        if error:
             return jsonify({
                 'success': False,
-                'error': 'Title and storyline are required'
+                'error': error
             }), 400
         
-        title = data['title']
-        storyline = data['storyline']
-        comic_style = data.get('comic_style', 'western comic')
-        num_scenes = data.get('num_scenes', 10)
-        age_group = data.get('age_group', 'general')
-        education_level = data.get('education_level', 'intermediate')
-        visual_detail = data.get('visual_detail', 'moderate')
-        camera_style = data.get('camera_style', 'varied')
-        color_palette = data.get('color_palette', 'natural')
-        scene_pacing = data.get('scene_pacing', 'moderate')
-        negative_concepts = data.get('negative_concepts', ['text', 'letters', 'watermark', 'logo', 'caption', 'speech bubble', 'ui'])
-        character_sheet = data.get('character_sheet', '')
-        style_sheet = data.get('style_sheet', '')
-        
         # Get story service
         story_service = get_story_service()
         
         # Generate scene prompts with all customization options
         scene_prompts = story_service.generate_scene_prompts(
-            title=title,
-            storyline=storyline,
-            comic_style=comic_style,
-            num_scenes=num_scenes,
-            age_group=age_group,
-            education_level=education_level,
-            negative_concepts=negative_concepts,
-            character_sheet=character_sheet,
-            style_sheet=style_sheet,
-            visual_detail=visual_detail,
-            camera_style=camera_style,
-            color_palette=color_palette,
-            scene_pacing=scene_pacing
+            title=data.title,
+            storyline=data.storyline,
+            comic_style=data.comic_style,
+            num_scenes=data.num_scenes,
+            age_group=data.age_group,
+            education_level=data.education_level,
+            negative_concepts=data.negative_concepts,
+            character_sheet=data.character_sheet,
+            style_sheet=data.style_sheet,
+            visual_detail=data.visual_detail,
+            camera_style=data.camera_style,
+            color_palette=data.color_palette,
+            scene_pacing=data.scene_pacing
         )
         
-        return jsonify({
+        return json_response({
             'success': True,
             'scene_prompts': scene_prompts,
             'count': len(scene_prompts)
-        }), 200
+        }, 200)
         
     except Exception as e:
         logger.error(f"Error in generate_scenes: {str(e)}")
@@ -189,6 +186,89 @@ def generate_scenes():
         }), 500
 
 
+@story_bp.route('/generate-scenes-stream', methods=['POST'])
+def generate_scenes_stream():
+    """
+    Generate scene prompts from storyline, streamed as Server-Sent Events
+    
+    Same request as /generate-scenes, but each prompt is sent as soon as the
+    model has finished writing it instead of after the whole list.
+    
+    Request JSON:
+        Same as /generate-scenes
+    
+    Event data JSON (one per scene, in order):
+        {
+            "scene_number": int,
+            "scene_prompt": str
+        }
+    
+    Final event data JSON:
+        {
+            "done": true,
+            "count": int
+        }
+        or, if generation failed part-way:
+        {
+            "done": true,
+            "error": str
+        }
+    """
+    try:
+        data, error = decode_request(request.get_data(cache=False), ScenePromptsRequest)
+        
+        if error:
+            return jsonify({
+                'success': False,
+                'error': error
+            }), 400
+        
+        # Get story service before streaming so configuration errors get a 500
+        story_service = get_story_service()
+        
+        return Response(
+            _scene_prompt_events(story_service, data),
+            mimetype='text/event-stream',
+            headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+        )
+        
+    except Exception as e:
+        logger.error(f"Error in generate_scenes_stream: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+def _scene_prompt_events(story_service: StoryService, data: ScenePromptsRequest):
+    """Yield an SSE event per scene prompt, then a closing event"""
+    count = 0
+    try:
+        for scene_prompt in story_service.stream_scene_prompts(
+            title=data.title,
+            storyline=data.storyline,
+            comic_style=data.comic_style,
+            num_scenes=data.num_scenes,
+            age_group=data.age_group,
+            education_level=data.education_level,
+            negative_concepts=data.negative_concepts,
+            character_sheet=data.character_sheet,
+            style_sheet=data.style_sheet,
+            visual_detail=data.visual_detail,
+            camera_style=data.camera_style,
+            color_palette=data.color_palette,
+            scene_pacing=data.scene_pacing
+        ):
+            count += 1
+            yield b"data: " + json_bytes({'scene_number': count, 'scene_prompt': scene_prompt}) + b"\n\n"
+    except Exception as e:
+        logger.error(f"Error in generate_scenes_stream: {str(e)}")
+        yield b"data: " + json_bytes({'done': True, 'error': str(e)}) + b"\n\n"
+        return
+    
+    yield b"data: " + json_bytes({'done': True, 'count': count}) + b"\n\n"
+
+
 @story_bp.route('/generate-complete', methods=['POST'])
 def generate_complete():
     """
@@ -218,47 +298,35 @@ def generate_complete():
         }
     """
     try:
-        data = request.get_json()
+        data, error = decode_request(request.get_data(cache=False), CompleteStoryRequest)
         
-        if not data or 'title' not in data or 'content' not in data:
+        if error:
             return jsonify({
                 'success': False,
-                'error': 'Title and content are required'
+                'error': error
             }), 400
         
-        title = data['title']
-        content = data['content']
-        target_length = data.get('target_length', 'medium')
-        max_chars = data.get('max_chars', 25000)
-        comic_style = data.get('comic_style', 'western comic')
-        num_scenes = data.get('num_scenes', 10)
-        age_group = data.get('age_group', 'general')
-        education_level = data.get('education_level', 'standard')
-        negative_concepts = data.get('negative_concepts', ['text', 'letters', 'watermark', 'logo', 'caption', 'speech bubble', 'ui'])
-        character_sheet = data.get('character_sheet', '')
-        style_sheet = data.get('style_sheet', '')
-        
         # Get story service
         story_service = get_story_service()
         
         # Generate storyline
         storyline = story_service.generate_comic_storyline(
-            title, content, target_length, max_chars
+            data.title, data.content, data.target_length, data.max_chars
         )
         
         # Generate scene prompts
         scene_prompts = story_service.generate_scene_prompts(
-            title, storyline, comic_style, num_scenes,
-            age_group, education_level, negative_concepts,
-            character_sheet, style_sheet
+            data.title, storyline, data.comic_style, data.num_scenes,
+            data.age_group, data.education_level, data.negative_concepts,
+            data.character_sheet, data.style_sheet
         )
         
-        return jsonify({
+        return json_response({
             'success': True,
             'storyline': storyline,
             'scene_prompts': scene_prompts,
             'num_scenes': len(scene_prompts)
-        }), 200
+        }, 200)
         
     except Exception as e:
         logger.error(f"Error in generate_complete: {str(e)}")
@@ -267,3 +335,117 @@ def generate_complete():
             'error': str(e)
         }), 500
 
+
+
+@story_bp.route('/generate-complete-batch', methods=['POST'])
+def generate_complete_batch():
+    """
+    Generate complete stories (storyline + scene prompts) for several articles at once
+    
+    Each story is generated with a single fused Groq call, and the stories run
+    concurrently, so the batch takes about as long as its slowest story.
+    
+    Request JSON:
+        {
+            "items": list[{"title": str, "content": str}] (at most 20),
+            "target_length": str (optional),
+            "max_chars": int (optional),
+            "comic_style": str (optional),
+            "num_scenes": int (optional),
+            "age_group": str (optional),
+            "education_level": str (optional),
+            "negative_concepts": list[str] (optional),
+            "character_sheet": str (optional),
+            "style_sheet": str (optional)
+        }
+    
+    Response JSON:
+        {
+            "success": bool,
+            "results": list[{
+                "title": str,
+                "success": bool,
+                "storyline": str (if succeeded),
+                "scene_prompts": list[str] (if succeeded),
+                "num_scenes": int (if succeeded),
+                "error": str (if failed)
+            }],
+            "error": str (if failed)
+        }
+    """
+    try:
+        data, error = decode_request(request.get_data(cache=False), CompleteStoryBatchRequest)
+        
+        if error:
+            return jsonify({
+                'success': False,
+                'error': error
+            }), 400
+        
+        if not data.items:
+            return jsonify({
+                'success': False,
+                'error': 'items must be a non-empty list of objects with title and content'
+            }), 400
+        
+        items = data.items
+        if len(items) > BATCH_MAX_ITEMS:
+            return jsonify({
+                'success': False,
+                'error': f'At most {BATCH_MAX_ITEMS} items per batch'
+            }), 400
+        
+        options = {
+            'target_length': data.target_length,
+            'max_chars': data.max_chars,
+            'comic_style': data.comic_style,
+            'num_scenes': data.num_scenes,
+            'age_group': data.age_group,
+            'education_level': data.education_level,
+            'negative_concepts': data.negative_concepts,
+            'character_sheet': data.character_sheet,
+            'style_sheet': data.style_sheet
+        }
+        
+        # Get story service
+        story_service = get_story_service()
+        
+        def generate(item):
+            """Generate one story, reporting failure in its result instead of raising"""
+            title = item.title
+            try:
+                story = story_service.generate_storyline_and_prompts(
+                    title=title,
+                    content=item.content,
+                    **options
+                )
+                return {
+                    'title': title,
+                    'success': True,
+                    'storyline': story['storyline'],
+                    'scene_prompts': story['scene_prompts'],
+                    'num_scenes': len(story['scene_prompts'])
+                }
+            except Exception as e:
+                logger.error(f"Error generating batch story '{title}': {str(e)}")
+                return {
+                    'title': title,
+                    'success': False,
+                    'error': str(e)
+                }
+        
+        # map() keeps results in request order
+        with ThreadPoolExecutor(max_workers=min(BATCH_MAX_WORKERS, len(items))) as executor:
+            results = list(executor.map(generate, items))
+        
+        return json_response({
+            'success': True,
+            'results': results
+        }, 200)
+        
+    except Exception as e:
+        logger.error(f"Error in generate_complete_batch: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
@@ -4,20 +4,73 @@ Endpoints for video compilation from images and audio
 """
 
 import os
+import shutil
 import logging
-import base64
+import tempfile
 import json
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from flask import Blueprint, request, jsonify, send_file
 from io import BytesIO
+from urllib.parse import quote
 from services.video_service import video_service
 from services.supabase_service import supabase_service
-from utils.helpers import sanitize_filename
+from utils.helpers import sanitize_filename, b64encode_str, b64decode
+from utils.orjson_provider import json_bytes
 
 logger = logging.getLogger("VidyAI_Flask")
 
 video_bp = Blueprint('video', __name__)
 
+# Payloads decoded concurrently by /build
+DECODE_MAX_WORKERS = 8
+
+
+def _decode_to_file(data_b64: str, path: str) -> str:
+    """Decode a base64 payload into a file and return its path"""
+    with open(path, 'wb') as f:
+        f.write(b64decode(data_b64))
+    return path
+
+
+# Response fields sent as headers when the video itself is the response body
+VIDEO_RESPONSE_HEADERS = {
+    'title_sanitized': 'X-Title-Sanitized',
+    'video_path': 'X-Video-Path',
+    'supabase_url': 'X-Video-URL',
+    'subtitles_path': 'X-Subtitles-Path',
+    'subtitles_url': 'X-Subtitles-URL'
+}
+
+
+def _video_file_response(video_data: bytes, title_sanitized: str, fields: dict):
+    """
+    Send a built MP4 as the raw response body (response_mode "binary")
+    
+    The other response fields travel as headers: string values are
+    percent-encoded (headers are latin-1) and timings are compact JSON.
+    
+    Args:
+        video_data: MP4 bytes
+        title_sanitized: Sanitized title, used for the download file name
+        fields: The fields the JSON response would have carried
+        
+    Returns:
+        Flask Response with mimetype video/mp4
+    """
+    response = send_file(
+        BytesIO(video_data),
+        mimetype='video/mp4',
+        download_name=f"{title_sanitized}.mp4"
+    )
+    for field, header in VIDEO_RESPONSE_HEADERS.items():
+        value = fields.get(field)
+        if value:
+            response.headers[header] = quote(value, safe="/:?=&%")
+    if fields.get('timings') is not None:
+        response.headers['X-Timings'] = json_bytes(fields['timings']).decode('utf-8')
+    return response
+
 
 @video_bp.route('/build', methods=['POST'])
 def build_video():
@@ -44,7 +97,8 @@ def build_video():
             "kb_pan": str (optional, default: "auto", choices: "auto", "left", "right", "up", "down", "none"),
             "upload_to_supabase": bool (optional, default: false),
             "project_name": str (optional, for supabase path),
-            "generate_subtitles": bool (optional, default: same as upload_to_supabase)
+            "generate_subtitles": bool (optional, default: same as upload_to_supabase),
+            "response_mode": str (optional, "json" (default) or "binary")
         }
     
     Response JSON:
@@ -54,9 +108,17 @@ def build_video():
             "supabase_url": str (if uploaded),
             "error": str (if failed)
         }
+    
+    Response (response_mode "binary"):
+        The MP4 itself (video/mp4), with X-Title-Sanitized, X-Video-Path,
+        X-Video-URL, X-Subtitles-Path and X-Subtitles-URL headers (when set)
+        and X-Timings (JSON). Subtitles are only available through
+        X-Subtitles-URL, i.e. when upload_to_supabase is true.
     """
+    # Decoded payloads are written here and handed to the service as paths
+    payload_dir = None
     try:
-        data = request.get_json()
+        data = request.get_json(silent=True, cache=False)
         
         if not data or 'images' not in data or 'scene_audio' not in data or 'title' not in data:
             return jsonify({
@@ -64,23 +126,33 @@ def build_video():
                 'error': 'images, scene_audio, and title are required'
             }), 400
         
-        # Decode images from base64
-        images_base64 = data['images']
-        images = []
-        for img_b64 in images_base64:
-            if img_b64:
-                images.append(base64.b64decode(img_b64))
-            else:
-                images.append(None)
+        # Decode each payload straight to disk so only a few decoded blobs are
+        # held in memory at a time
+        payload_dir = tempfile.mkdtemp(prefix='vidyai_payload_')
         
-        # Decode audio from base64
+        # Images, scene audio and background music, as paths in payload_dir
+        images_base64 = data['images']
+        images = [
+            os.path.join(payload_dir, f"scene_{i}.jpg") if img_b64 else None
+            for i, img_b64 in enumerate(images_base64, 1)
+        ]
         scene_audio_base64 = data['scene_audio']
-        scene_audio = {}
-        for scene_key, audio_b64 in scene_audio_base64.items():
-            if audio_b64:
-                scene_audio[scene_key] = base64.b64decode(audio_b64)
-            else:
-                scene_audio[scene_key] = None
+        scene_audio = {
+            scene_key: os.path.join(payload_dir, f"audio_{i}.mp3") if audio_b64 else None
+            for i, (scene_key, audio_b64) in enumerate(scene_audio_base64.items(), 1)
+        }
+        bg_music_data = None
+        
+        decode_jobs = [(img_b64, path) for img_b64, path in zip(images_base64, images) if path]
+        decode_jobs += [(scene_audio_base64[key], path) for key, path in scene_audio.items() if path]
+        if bg_music := data.get('bg_music'):
+            bg_music_data = os.path.join(payload_dir, "bg_music.mp3")
+            decode_jobs.append((bg_music, bg_music_data))
+        
+        # Decode from base64 in parallel; the codec and file writes release the GIL
+        if decode_jobs:
+            with ThreadPoolExecutor(max_workers=min(DECODE_MAX_WORKERS, len(decode_jobs))) as executor:
+                list(executor.map(lambda job: _decode_to_file(*job), decode_jobs))
         
         title = data['title']
         fps = data.get('fps', 30)
@@ -95,13 +167,11 @@ def build_video():
         kb_zoom_end = data.get('kb_zoom_end', 1.15)
         kb_pan = data.get('kb_pan', 'auto')
         upload_to_supabase = data.get('upload_to_supabase', False)
+        binary_response = data.get('response_mode') == 'binary'
         title_sanitized = sanitize_filename(data.get('project_name', title))
         generate_subtitles = data.get('generate_subtitles', upload_to_supabase)
-        
-        # Decode background music if provided
-        bg_music_data = None
-        if 'bg_music' in data and data['bg_music']:
-            bg_music_data = base64.b64decode(data['bg_music'])
+        storyline = data.get('storyline')
+        scene_prompts = data.get('scene_prompts')
         
         # Extract narrations for subtitle generation
         # Narrations can come in different formats:
@@ -109,8 +179,8 @@ def build_video():
         # 2. List of narration texts: ["text1", "text2", ...]
         # 3. Dict with narrations nested: {"narrations": {"scene_1": {...}}}
         subtitle_narrations_list = None
-        if generate_subtitles and 'narrations' in data:
-            narrations_data = data['narrations']
+        narrations_data = data.get('narrations') if generate_subtitles else None
+        if narrations_data is not None:
             subtitle_narrations_list = []
             
             # Handle dict format with scene keys
@@ -182,45 +252,72 @@ def build_video():
                 'error': 'Video generation failed - no video data returned'
             }), 500
 
-        # Convert to base64
-        video_base64 = base64.b64encode(video_data).decode('utf-8') if video_data else None
-        subtitles_base64 = base64.b64encode(subtitles_bytes).decode('utf-8') if subtitles_bytes else None
-        
         response = {
             'success': True,
-            'video': video_base64,
             'title_sanitized': title_sanitized,
             'timings': timings
         }
-        if subtitles_base64:
-            response['subtitles'] = subtitles_base64
+        if not binary_response:
+            # Convert to base64
+            response['video'] = b64encode_str(video_data)
+            if subtitles_bytes:
+                response['subtitles'] = b64encode_str(subtitles_bytes)
         
         # Upload to Supabase if requested
         if upload_to_supabase and video_data:
             video_path = f"{title_sanitized}/{title_sanitized}.mp4"
-            result = supabase_service.upload_file('video', video_path, video_data, 'video/mp4')
+            subtitles_path = f"{title_sanitized}/{title_sanitized}.srt" if subtitles_bytes else None
+            
+            # First wave: the video, its subtitles and the text files are
+            # independent, so upload them concurrently
+            upload_jobs = [('video', video_path, video_data, 'video/mp4')]
+            if subtitles_bytes:
+                upload_jobs.append(('video', subtitles_path, subtitles_bytes, 'text/plain'))
+            
+            # Store text files (storyline and scene prompts) if provided
+            text_labels = []
+            try:
+                if storyline:
+                    storyline_text = f"# {title} - Comic Storyline\n\n{storyline}"
+                    storyline_path = f"{title_sanitized}/storyline.txt"
+                    upload_jobs.append(('text', storyline_path, storyline_text.encode('utf-8'), 'text/plain'))
+                    text_labels.append('Storyline text')
+                
+                if scene_prompts:
+                    separator = '=' * 50
+                    parts = [f"# {title} - Scene Prompts\n\n"]
+                    for i, prompt in enumerate(scene_prompts, 1):
+                        parts.append(f"## Scene {i}\n{prompt}\n\n{separator}\n\n")
+                    scene_prompts_text = "".join(parts)
+                    scene_prompts_path = f"{title_sanitized}/scene_prompts.txt"
+                    upload_jobs.append(('text', scene_prompts_path, scene_prompts_text.encode('utf-8'), 'text/plain'))
+                    text_labels.append('Scene prompts text')
+            except Exception as e:
+                logger.warning(f"Failed to store text files: {e}")
+            
+            upload_results = supabase_service.upload_files(upload_jobs)
+            
+            result = upload_results[0]
             if result['success']:
                 response['video_path'] = video_path
                 response['supabase_url'] = result['public_url']
 
-            # Upload subtitles to video bucket alongside MP4
+            # Subtitles are uploaded to the video bucket alongside the MP4
             subtitles_url = None
-            subtitles_path = None
             if subtitles_bytes:
-                subtitles_path = f"{title_sanitized}/{title_sanitized}.srt"
-                sub_result = supabase_service.upload_file(
-                    'video',
-                    subtitles_path,
-                    subtitles_bytes,
-                    'text/plain'
-                )
+                sub_result = upload_results[1]
                 if sub_result.get('success'):
                     subtitles_url = sub_result.get('public_url')
                 response['subtitles_path'] = subtitles_path
                 response['subtitles_url'] = subtitles_url
+            
+            text_results = upload_results[len(upload_results) - len(text_labels):]
+            for label, text_result in zip(text_labels, text_results):
+                if text_result['success']:
+                    logger.info(f"{label} stored for project: {title_sanitized}")
 
-            # Store metadata if provided
-            if 'storyline' in data or 'scene_prompts' in data:
+            # Second wave: metadata records the URLs produced by the first
+            if storyline is not None or scene_prompts is not None:
                 try:
                     metadata = {
                         'title': title,
@@ -235,10 +332,10 @@ def build_video():
                         'num_scenes': len(images)
                     }
                     
-                    if 'storyline' in data:
-                        metadata['storyline'] = data['storyline']
-                    if 'scene_prompts' in data:
-                        metadata['scene_prompts'] = data['scene_prompts']
+                    if storyline is not None:
+                        metadata['storyline'] = storyline
+                    if scene_prompts is not None:
+                        metadata['scene_prompts'] = scene_prompts
                     if 'wikiUrl' in data:
                         metadata['wikiUrl'] = data['wikiUrl']
                     if 'wikiTitle' in data:
@@ -256,36 +353,9 @@ def build_video():
                         logger.info(f"Metadata stored for project: {title_sanitized}")
                 except Exception as e:
                     logger.warning(f"Failed to store metadata: {e}")
-            
-            # Store text files (storyline and scene prompts) if provided
-            try:
-                if 'storyline' in data and data['storyline']:
-                    storyline_text = f"# {title} - Comic Storyline\n\n{data['storyline']}"
-                    storyline_path = f"{title_sanitized}/storyline.txt"
-                    storyline_result = supabase_service.upload_file(
-                        'text',
-                        storyline_path,
-                        storyline_text.encode('utf-8'),
-                        'text/plain'
-                    )
-                    if storyline_result['success']:
-                        logger.info(f"Storyline text stored for project: {title_sanitized}")
-                
-                if 'scene_prompts' in data and data['scene_prompts']:
-                    scene_prompts_text = f"# {title} - Scene Prompts\n\n"
-                    for i, prompt in enumerate(data['scene_prompts'], 1):
-                        scene_prompts_text += f"## Scene {i}\n{prompt}\n\n{'='*50}\n\n"
-                    scene_prompts_path = f"{title_sanitized}/scene_prompts.txt"
-                    scene_prompts_result = supabase_service.upload_file(
-                        'text',
-                        scene_prompts_path,
-                        scene_prompts_text.encode('utf-8'),
-                        'text/plain'
-                    )
-                    if scene_prompts_result['success']:
-                        logger.info(f"Scene prompts text stored for project: {title_sanitized}")
-            except Exception as e:
-                logger.warning(f"Failed to store text files: {e}")
+        
+        if binary_response:
+            return _video_file_response(video_data, title_sanitized, response)
         
         return jsonify(response), 200
         
@@ -295,6 +365,10 @@ def build_video():
             'success': False,
             'error': str(e)
         }), 500
+    
+    finally:
+        if payload_dir:
+            shutil.rmtree(payload_dir, ignore_errors=True)
 
 
 @video_bp.route('/build-from-supabase', methods=['POST'])
@@ -309,19 +383,23 @@ def build_from_supabase():
             "num_scenes": int,
             "fps": int (optional),
             "resolution": list[int, int] (optional),
-            "other_video_params": ... (same as /build)
+            "other_video_params": ... (same as /build),
+            "response_mode": str (optional, "json" (default) or "binary", as for /build),
+            "include_video_base64": bool (optional, default: false),
+            "include_subtitles_base64": bool (optional, default: false)
         }
     
     Response JSON:
         {
             "success": bool,
-            "video": str (base64) or null,
+            "video": str (base64, if include_video_base64) or null,
+            "subtitles": str (base64, if include_subtitles_base64 and generated),
             "supabase_url": str (if uploaded),
             "error": str (if failed)
         }
     """
     try:
-        data = request.get_json()
+        data = request.get_json(silent=True, cache=False)
         
         if not data or 'project_name' not in data or 'title' not in data or 'num_scenes' not in data:
             return jsonify({
@@ -334,21 +412,24 @@ def build_from_supabase():
         num_scenes = data['num_scenes']
         title_sanitized = sanitize_filename(project_name or title)
         
-        # Download images from Supabase
-        images = []
-        for i in range(1, num_scenes + 1):
-            path = f"{title_sanitized}/scene_{i}.jpg"
-            img_result = supabase_service.download_file('images', path)
-            images.append(img_result.get('file_data') if img_result.get('success') else None)
+        # Download every scene's image and audio from Supabase concurrently
+        scene_numbers = range(1, num_scenes + 1)
+        results = supabase_service.download_files(
+            [('images', f"{title_sanitized}/scene_{i}.jpg") for i in scene_numbers] +
+            [('audio', f"{title_sanitized}/scene_{i}.mp3") for i in scene_numbers]
+        )
+        image_results = results[:num_scenes]
+        audio_results = results[num_scenes:]
+        
+        images = [
+            img_result.get('file_data') if img_result.get('success') else None
+            for img_result in image_results
+        ]
         
-        # Download audio from Supabase
         scene_audio = {}
-        for i in range(1, num_scenes + 1):
-            scene_key = f"scene_{i}"
-            path = f"{title_sanitized}/scene_{i}.mp3"
-            audio_result = supabase_service.download_file('audio', path)
+        for i, audio_result in zip(scene_numbers, audio_results):
             if audio_result.get('success') and audio_result.get('file_data'):
-                scene_audio[scene_key] = audio_result['file_data']
+                scene_audio[f"scene_{i}"] = audio_result['file_data']
         
         # Build video with downloaded assets
         fps = data.get('fps', 30)
@@ -380,26 +461,23 @@ def build_from_supabase():
                 'error': 'Video generation failed - no video data returned'
             }), 500
         
-        # Upload to Supabase
+        # Upload to Supabase (video and subtitles concurrently)
         video_path = f"{title_sanitized}/{title_sanitized}.mp4"
-        result = supabase_service.upload_file('video', video_path, video_data, 'video/mp4')
+        upload_jobs = [('video', video_path, video_data, 'video/mp4')]
 
         subtitles_url = None
         subtitles_path = None
         if subtitles_bytes:
             subtitles_path = f"{title_sanitized}/{title_sanitized}.srt"
-            sub_result = supabase_service.upload_file(
-                'video',
-                subtitles_path,
-                subtitles_bytes,
-                'text/plain'
-            )
-            if sub_result.get('success'):
-                subtitles_url = sub_result.get('public_url')
+            upload_jobs.append(('video', subtitles_path, subtitles_bytes, 'text/plain'))
+        
+        upload_results = supabase_service.upload_files(upload_jobs)
+        result = upload_results[0]
+        if subtitles_bytes and upload_results[1].get('success'):
+            subtitles_url = upload_results[1].get('public_url')
         
         response = {
             'success': True,
-            'video': base64.b64encode(video_data).decode('utf-8') if video_data else None,
             'supabase_url': result.get('public_url') if result.get('success') else None,
             'video_path': video_path,
             'subtitles_path': subtitles_path,
@@ -407,6 +485,13 @@ def build_from_supabase():
             'timings': timings
         }
         
+        if data.get('response_mode') == 'binary':
+            return _video_file_response(video_data, title_sanitized, response)
+        
+        # The base64 bodies are opt-in: callers normally fetch the uploaded files by URL
+        response['video'] = b64encode_str(video_data) if data.get('include_video_base64', False) else None
+        if subtitles_bytes and data.get('include_subtitles_base64', False):
+            response['subtitles'] = b64encode_str(subtitles_bytes)
         return jsonify(response), 200
         
     except Exception as e:
@@ -428,7 +513,7 @@ def get_subtitles_url():
         }
     """
     try:
-        data = request.get_json()
+        data = request.get_json(silent=True, cache=False)
         if not data or 'title' not in data:
             return jsonify({
                 'success': False,
@@ -471,7 +556,7 @@ def download_subtitles():
         }
     """
     try:
-        data = request.get_json()
+        data = request.get_json(silent=True, cache=False)
         if not data or 'title' not in data:
             return jsonify({
                 'success': False,
@@ -33,7 +33,7 @@ def search_wikipedia():
         }
     """
     try:
-        data = request.get_json()
+        data = request.get_json(silent=True, cache=False)
         
         if not data or 'query' not in data:
             return jsonify({
@@ -93,7 +93,7 @@ def get_page():
         }
     """
     try:
-        data = request.get_json()
+        data = request.get_json(silent=True, cache=False)
         
         if not data or 'title' not in data:
             return jsonify({
@@ -155,7 +155,7 @@ def set_language():
         }
     """
     try:
-        data = request.get_json()
+        data = request.get_json(silent=True, cache=False)
         
         if not data or 'language' not in data:
             return jsonify({
@@ -1,19 +1,30 @@
 """
 Services Package
 Business logic services for the application
+
+Service singletons are resolved on first attribute access (PEP 562) so that
+importing one service (e.g. supabase_service) does not also load MoviePy,
+gTTS and the other heavy dependencies of unrelated services.
 """
 
-from .supabase_service import supabase_service
-from .wikipedia_service import wikipedia_service
-from .tts_service import tts_service
-from .video_service import video_service
-from .project_service import project_service
+import importlib
+
+_SERVICE_MODULES = {
+    'supabase_service': 'supabase_service',
+    'wikipedia_service': 'wikipedia_service',
+    'tts_service': 'tts_service',
+    'tts_cache': 'tts_cache',
+    'response_cache': 'response_cache',
+    'upload_jobs': 'upload_jobs',
+    'video_service': 'video_service',
+    'project_service': 'project_service'
+}
+
+__all__ = list(_SERVICE_MODULES)
 
-__all__ = [
-    'supabase_service',
-    'wikipedia_service',
-    'tts_service',
-    'video_service',
-    'project_service'
-]
 
+def __getattr__(name):
+    module_name = _SERVICE_MODULES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(f".{module_name}", __name__), name)
@@ -322,57 +322,63 @@ Quality standards:
         """
         logger.info(f"Generating {len(scene_prompts)} scenes for {comic_title} with quality={image_quality}, lighting={lighting_style}, colors={color_temperature}")
         
+        # Import progress tracker
+        from services.progress_service import progress_tracker
+        task_id = f"images_{comic_title.replace(' ', '_')}"
+        
         if not self.client:
             logger.error("Gemini client not initialized.")
+            progress_tracker.fail_progress(task_id, "Gemini client not initialized")
             return []
         
         images = []
         total_scenes = len(scene_prompts)
         
-        # Import progress tracker
-        from services.progress_service import progress_tracker
-        task_id = f"images_{comic_title.replace(' ', '_')}"
-        
-        for i, prompt in enumerate(scene_prompts):
-            scene_num = i + 1
-            
-            # Calculate and update progress
-            progress_percent = int((i / total_scenes) * 100)
-            progress_tracker.set_progress(
-                task_id,
-                progress_percent,
-                f"Generating image {scene_num} of {total_scenes}",
-                scene_num,
-                total_scenes
-            )
-            
-            logger.info(f"Processing scene {scene_num}/{total_scenes} ({progress_percent}%)")
-            image_data = self.generate_comic_image(
-                scene_prompt=prompt,
-                scene_num=scene_num,
-                style_sheet=style_sheet,
-                character_sheet=character_sheet,
-                negative_concepts=negative_concepts,
-                aspect_ratio=aspect_ratio,
-                image_quality=image_quality,
-                lighting_style=lighting_style,
-                color_temperature=color_temperature
-            )
-            
-            images.append(image_data)
-            
-            # Update progress after completion
-            progress_percent = int(((i + 1) / total_scenes) * 100)
-            progress_tracker.set_progress(
-                task_id,
-                progress_percent,
-                f"Completed image {scene_num} of {total_scenes}",
-                scene_num,
-                total_scenes
-            )
-            
-            if scene_num < total_scenes:
-                time.sleep(1)
+        # Mark the task failed if a scene raises, so progress streams can close
+        try:
+            for i, prompt in enumerate(scene_prompts):
+                scene_num = i + 1
+                
+                # Calculate and update progress
+                progress_percent = int((i / total_scenes) * 100)
+                progress_tracker.set_progress(
+                    task_id,
+                    progress_percent,
+                    f"Generating image {scene_num} of {total_scenes}",
+                    scene_num,
+                    total_scenes
+                )
+                
+                logger.info(f"Processing scene {scene_num}/{total_scenes} ({progress_percent}%)")
+                image_data = self.generate_comic_image(
+                    scene_prompt=prompt,
+                    scene_num=scene_num,
+                    style_sheet=style_sheet,
+                    character_sheet=character_sheet,
+                    negative_concepts=negative_concepts,
+                    aspect_ratio=aspect_ratio,
+                    image_quality=image_quality,
+                    lighting_style=lighting_style,
+                    color_temperature=color_temperature
+                )
+                
+                images.append(image_data)
+                
+                # Update progress after completion
+                progress_percent = int(((i + 1) / total_scenes) * 100)
+                progress_tracker.set_progress(
+                    task_id,
+                    progress_percent,
+                    f"Completed image {scene_num} of {total_scenes}",
+                    scene_num,
+                    total_scenes
+                )
+                
+                if scene_num < total_scenes:
+                    time.sleep(1)
+        except Exception as e:
+            progress_tracker.fail_progress(task_id, str(e))
+            raise
         
         # Mark as complete
         progress_tracker.set_progress(task_id, 100, "All images generated", total_scenes, total_scenes)
@@ -4,11 +4,15 @@ Handles scene narration generation using Groq
 """
 
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any
 from groq import Groq
 
 logger = logging.getLogger("VidyAI_Flask")
 
+# Concurrent Groq requests when narrating a whole story
+NARRATION_MAX_WORKERS = 8
+
 
 class NarrationService:
     """Service for narration generation using Groq"""
@@ -256,9 +260,8 @@ class NarrationService:
         """
         logger.info(f"Generating narrations for all {len(scene_prompts)} scenes of '{title}' with style={narration_style}, tone={voice_tone}, length={narration_length}")
         
-        narrations = {}
-        for i, scene_prompt in enumerate(scene_prompts, 1):
-            narration = self.generate_scene_narration(
+        def narrate(i: int, scene_prompt: str) -> str:
+            return self.generate_scene_narration(
                 title=title,
                 scene_prompt=scene_prompt,
                 scene_number=i,
@@ -274,6 +277,15 @@ class NarrationService:
                 pause_style=pause_style,
                 pronunciation_style=pronunciation_style
             )
+        
+        # Scenes are independent Groq calls, so issue them concurrently;
+        # map() keeps results in scene order and re-raises the first failure
+        scene_numbers = range(1, len(scene_prompts) + 1)
+        with ThreadPoolExecutor(max_workers=max(1, min(NARRATION_MAX_WORKERS, len(scene_prompts)))) as executor:
+            scene_narrations = list(executor.map(narrate, scene_numbers, scene_prompts))
+        
+        narrations = {}
+        for i, scene_prompt, narration in zip(scene_numbers, scene_prompts, scene_narrations):
             narrations[f"scene_{i}"] = {
                 "scene_number": i,
                 "narration": narration,
@@ -13,6 +13,10 @@ class ProgressTracker:
     def __init__(self):
         self._progress: Dict[str, Dict] = {}
         self._lock = threading.Lock()
+        # Monotonic counter stamped on every update; used as the task's ETag
+        self._version = 0
+        # Notified on every set/clear so streaming readers wake only on change
+        self.changed = threading.Condition(self._lock)
     
     def set_progress(self, task_id: str, progress: int, message: str = "", current: int = 0, total: int = 0):
         """Set progress for a task
@@ -25,13 +29,38 @@ class ProgressTracker:
             total: Total items
         """
         with self._lock:
+            self._version += 1
             self._progress[task_id] = {
                 "progress": max(0, min(100, progress)),
                 "message": message,
                 "current": current,
                 "total": total,
-                "timestamp": time.time()
+                "timestamp": time.time(),
+                "version": self._version,
+                "error": None
             }
+            self.changed.notify_all()
+    
+    def fail_progress(self, task_id: str, error: str):
+        """Mark a task as failed, keeping its last progress values
+        
+        Args:
+            task_id: Unique task identifier
+            error: Error message
+        """
+        with self._lock:
+            self._version += 1
+            previous = self._progress.get(task_id) or {}
+            self._progress[task_id] = {
+                "progress": previous.get("progress", 0),
+                "message": f"Failed: {error}",
+                "current": previous.get("current", 0),
+                "total": previous.get("total", 0),
+                "timestamp": time.time(),
+                "version": self._version,
+                "error": error
+            }
+            self.changed.notify_all()
     
     def get_progress(self, task_id: str) -> Optional[Dict]:
         """Get current progress for a task"""
@@ -43,6 +72,26 @@ class ProgressTracker:
         with self._lock:
             if task_id in self._progress:
                 del self._progress[task_id]
+                self.changed.notify_all()
+    
+    def wait_for_update(self, task_id: str, last_timestamp: Optional[float], timeout: float = 1.0) -> Optional[Dict]:
+        """Block until a task's progress differs from last_timestamp or timeout expires
+        
+        Args:
+            task_id: Unique task identifier
+            last_timestamp: Timestamp of the snapshot the caller already has (None if none)
+            timeout: Maximum seconds to wait
+        
+        Returns:
+            Current progress snapshot (None if the task is unknown)
+        """
+        def _current_timestamp():
+            data = self._progress.get(task_id)
+            return data["timestamp"] if data else None
+        
+        with self.changed:
+            self.changed.wait_for(lambda: _current_timestamp() != last_timestamp, timeout=timeout)
+            return self._progress.get(task_id)
     
     def cleanup_old(self, max_age_seconds: int = 3600):
         """Remove old progress entries (older than max_age_seconds)"""
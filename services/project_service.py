@@ -146,7 +146,7 @@ class ProjectService:
                     return
                     
                 try:
-                    items = self.supabase.client.storage.from_(bucket_name).list(path=path)
+                    items = self.supabase.bucket(bucket_name).list(path=path)
                     
                     if items is None:
                         logger.warning(f"No items found at path: {path}")
@@ -174,7 +174,7 @@ class ProjectService:
                             if name and name.lower().endswith(('.mp4', '.avi', '.mov', '.webm', '.mkv')):
                                 try:
                                     # Get public URL
-                                    public_url = self.supabase.client.storage.from_(bucket_name).get_public_url(full_path)
+                                    public_url = self.supabase.bucket(bucket_name).get_public_url(full_path)
                                     
                                     # Extract title from folder name or filename
                                     if '/' in full_path:
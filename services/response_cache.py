@@ -0,0 +1,114 @@
+"""
+Response Cache
+Short-lived in-process cache for expensive GET responses derived from storage
+"""
+
+import os
+import time
+import logging
+import threading
+from typing import Callable, Dict, Optional, Tuple
+from utils.orjson_provider import content_etag
+
+logger = logging.getLogger("VidyAI_Flask")
+
+
+class ResponseCache:
+    """
+    Thread-safe TTL cache of serialized response bodies, tagged by storage bucket
+
+    Entries expire after ttl seconds, and are dropped early when a file in
+    the bucket they were computed from is uploaded or deleted. Each body's
+    ETag is a hash of its bytes, so it stays valid across worker restarts.
+    """
+
+    def __init__(self, ttl: float = 120):
+        """
+        Initialize Response Cache
+
+        Args:
+            ttl: Seconds an entry stays fresh (0 disables caching)
+        """
+        self.ttl = ttl
+        # key -> (expires_at, bucket, etag, body, encoded variants)
+        self._entries: Dict[str, Tuple[float, str, str, bytes, Dict[str, bytes]]] = {}
+        self._lock = threading.Lock()
+        logger.info(f"ResponseCache initialized (ttl={ttl}s)")
+
+    def get(self, key: str) -> Optional[Tuple[str, bytes]]:
+        """
+        Get a fresh cached response
+
+        Args:
+            key: Cache key
+
+        Returns:
+            (etag, body) tuple, or None if missing or expired
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, _, etag, body, _ = entry
+            if time.monotonic() >= expires_at:
+                del self._entries[key]
+                return None
+            return etag, body
+
+    def put(self, key: str, bucket: str, body: bytes) -> str:
+        """
+        Store a response body computed from a bucket's contents
+
+        Args:
+            key: Cache key
+            bucket: Bucket the body was derived from
+            body: Serialized response body
+
+        Returns:
+            ETag of the body (a hash of its bytes)
+        """
+        etag = content_etag(body)
+        if self.ttl > 0:
+            with self._lock:
+                self._entries[key] = (time.monotonic() + self.ttl, bucket, etag, body, {})
+        return etag
+
+    def variant(self, key: str, etag: str, name: str, build: Callable[[], bytes]) -> Optional[bytes]:
+        """
+        Get an encoded form of a cached body (e.g. its brotli encoding), building it once
+
+        Args:
+            key: Cache key
+            etag: ETag of the entry the caller holds
+            name: Variant name (e.g. 'br', 'gzip')
+            build: Produces the variant bytes on first use
+
+        Returns:
+            Variant bytes, or None if the entry has since expired or been replaced
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[2] != etag:
+                return None
+            data = entry[4].get(name)
+
+        if data is None:
+            data = build()
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None and entry[2] == etag:
+                    data = entry[4].setdefault(name, data)
+        return data
+
+    def invalidate_bucket(self, bucket: str) -> None:
+        """Drop every entry derived from the given bucket"""
+        with self._lock:
+            stale = [key for key, entry in self._entries.items() if entry[1] == bucket]
+            for key in stale:
+                del self._entries[key]
+        if stale:
+            logger.debug("Invalidated cached responses for bucket %s: %s", bucket, stale)
+
+
+# Create cache instance
+response_cache = ResponseCache(ttl=int(os.getenv('RESPONSE_CACHE_TTL', 120)))
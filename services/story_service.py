@@ -4,12 +4,19 @@ Handles comic storyline and scene prompt generation using Groq
 """
 
 import re
+import json
 import logging
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator, Tuple
 from groq import Groq
 
 logger = logging.getLogger("VidyAI_Flask")
 
+# System prompt shared by generate_scene_prompts and stream_scene_prompts
+SCENE_PROMPT_SYSTEM_MESSAGE = "You are an expert comic artist who creates exciting, easy-to-understand scene descriptions for STUDENTS. You use SIMPLE, CLEAR words that anyone can understand. You describe what people see in each panel using everyday language, making sure the story is exciting and easy to follow. You never use complex vocabulary - you explain things like you're talking to a friend. Your scenes flow naturally from one to the next, and you always make sure NO text appears in the images."
+
+# One scene prompt: from its "Scene N:" header up to the next header or the end
+SCENE_PATTERN = re.compile(r'Scene \d+:.*?(?=Scene \d+:|$)', re.DOTALL)
+
 
 class StoryService:
     """Service for story generation using Groq"""
@@ -64,6 +71,328 @@ class StoryService:
         """
         logger.info(f"Generating comic storyline for: {title} with target length: {target_length}, tone: {tone}, audience: {target_audience}")
         
+        system_message, prompt = self._build_storyline_messages(
+            title, content, target_length, max_chars, tone, target_audience,
+            complexity, focus_style, scene_count, educational_level, visual_style
+        )
+        
+        try:
+            response = self.client.chat.completions.create(
+                messages=[
+                    {"role": "system", "content": system_message},
+                    {"role": "user", "content": prompt}
+                ],
+                model="llama-3.3-70b-versatile",
+                temperature=0.4,
+                max_tokens=12000,
+                top_p=0.9
+            )
+            
+            storyline = response.choices[0].message.content
+            logger.info(f"Successfully generated comic storyline for: {title}")
+            return storyline
+            
+        except Exception as e:
+            logger.error(f"Failed to generate storyline: {str(e)}")
+            raise Exception(f"Error generating storyline: {str(e)}")
+    
+    def generate_scene_prompts(
+        self,
+        title: str,
+        storyline: str,
+        comic_style: str,
+        num_scenes: int = 10,
+        age_group: str = "general",
+        education_level: str = "intermediate",
+        negative_concepts: List[str] = None,
+        character_sheet: str = "",
+        style_sheet: str = "",
+        visual_detail: str = "moderate",
+        camera_style: str = "varied",
+        color_palette: str = "natural",
+        scene_pacing: str = "moderate"
+    ) -> List[str]:
+        """
+        Generate scene prompts for comic panels
+        
+        Args:
+            title: Title of the article
+            storyline: Generated comic storyline
+            comic_style: Selected comic art style
+            num_scenes: Number of scene prompts
+            age_group: Target age group
+            education_level: Education level
+            negative_concepts: Concepts to avoid
+            character_sheet: Character consistency guide
+            style_sheet: Style consistency guide
+            
+        Returns:
+            List of scene prompts
+        """
+        logger.info(f"Generating {num_scenes} scene prompts for comic in {comic_style} style")
+        
+        prompt = self._build_scene_prompt(
+            title, storyline, comic_style, num_scenes, age_group, education_level,
+            negative_concepts, character_sheet, style_sheet, visual_detail,
+            camera_style, color_palette, scene_pacing
+        )
+        
+        try:
+            response = self.client.chat.completions.create(
+                messages=[
+                    {"role": "system", "content": SCENE_PROMPT_SYSTEM_MESSAGE},
+                    {"role": "user", "content": prompt}
+                ],
+                model="llama-3.3-70b-versatile",
+                temperature=0.4,
+                max_tokens=12000,
+                top_p=0.9
+            )
+            
+            scenes_text = response.choices[0].message.content
+            
+            # Process text to extract scene prompts
+            matches = SCENE_PATTERN.findall(scenes_text)
+            validated_prompts = self._clean_scene_prompts(matches, num_scenes, title, comic_style, age_group)
+            
+            logger.info(f"Successfully generated {len(validated_prompts)} scene prompts")
+            return validated_prompts
+            
+        except Exception as e:
+            logger.error(f"Failed to generate scene prompts: {str(e)}")
+            raise Exception(f"Error generating scene prompts: {str(e)}")
+    
+    def stream_scene_prompts(
+        self,
+        title: str,
+        storyline: str,
+        comic_style: str,
+        num_scenes: int = 10,
+        age_group: str = "general",
+        education_level: str = "intermediate",
+        negative_concepts: List[str] = None,
+        character_sheet: str = "",
+        style_sheet: str = "",
+        visual_detail: str = "moderate",
+        camera_style: str = "varied",
+        color_palette: str = "natural",
+        scene_pacing: str = "moderate"
+    ) -> Iterator[str]:
+        """
+        Generate scene prompts, yielding each one as soon as the model finishes it
+        
+        Takes the same arguments as generate_scene_prompts and yields the same
+        prompts in the same order (including padding if the model returns too
+        few), but reads the Groq response as a stream: a scene is complete once
+        the next "Scene N:" header arrives.
+        
+        Yields:
+            Cleaned scene prompts, num_scenes in total
+        """
+        logger.info(f"Streaming {num_scenes} scene prompts for comic in {comic_style} style")
+        
+        prompt = self._build_scene_prompt(
+            title, storyline, comic_style, num_scenes, age_group, education_level,
+            negative_concepts, character_sheet, style_sheet, visual_detail,
+            camera_style, color_palette, scene_pacing
+        )
+        
+        try:
+            stream = self.client.chat.completions.create(
+                messages=[
+                    {"role": "system", "content": SCENE_PROMPT_SYSTEM_MESSAGE},
+                    {"role": "user", "content": prompt}
+                ],
+                model="llama-3.3-70b-versatile",
+                temperature=0.4,
+                max_tokens=12000,
+                top_p=0.9,
+                stream=True
+            )
+            
+            scenes_text = ""
+            search_from = 0
+            raw_prompts = []
+            yielded = 0
+            for chunk in stream:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if not delta:
+                    continue
+                scenes_text += delta
+                
+                # A scene is complete once the next "Scene N:" header follows it
+                # ($ also matches before a trailing newline, so check explicitly)
+                while yielded < num_scenes:
+                    match = SCENE_PATTERN.search(scenes_text, search_from)
+                    if match is None or not scenes_text.startswith('Scene', match.end()):
+                        break
+                    raw_prompts.append(match.group())
+                    search_from = match.end()
+                    yield self._clean_scene_prompts(raw_prompts[-1:], 1, title, comic_style, age_group)[0]
+                    yielded += 1
+                
+                if yielded >= num_scenes:
+                    # Everything needed has arrived; drop the rest of the response
+                    stream.close()
+                    break
+            else:
+                # Stream finished: the last scene runs to the end of the text
+                match = SCENE_PATTERN.search(scenes_text, search_from)
+                if match is not None:
+                    raw_prompts.append(match.group())
+            
+            validated_prompts = self._clean_scene_prompts(raw_prompts, num_scenes, title, comic_style, age_group)
+            
+        except Exception as e:
+            logger.error(f"Failed to stream scene prompts: {str(e)}")
+            raise Exception(f"Error generating scene prompts: {str(e)}")
+        
+        # Whatever was not yielded mid-stream: the final scene and any padding
+        yield from validated_prompts[yielded:]
+        
+        logger.info(f"Successfully streamed {len(validated_prompts)} scene prompts")
+    
+    def generate_storyline_and_prompts(
+        self,
+        title: str,
+        content: str,
+        num_scenes: int = 10,
+        comic_style: str = "western comic",
+        target_length: str = "medium",
+        max_chars: int = 25000,
+        tone: str = "casual",
+        target_audience: str = "general",
+        complexity: str = "moderate",
+        focus_style: str = "comprehensive",
+        educational_level: str = "intermediate",
+        education_level: str = "intermediate",
+        visual_style: str = "educational",
+        age_group: str = "general",
+        negative_concepts: List[str] = None,
+        character_sheet: str = "",
+        style_sheet: str = "",
+        visual_detail: str = "moderate",
+        camera_style: str = "varied",
+        color_palette: str = "natural",
+        scene_pacing: str = "moderate"
+    ) -> Dict[str, Any]:
+        """
+        Generate the storyline and its scene prompts in a single Groq call
+        
+        The model returns both as one JSON object, saving a full LLM round-trip.
+        Falls back to generate_comic_storyline + generate_scene_prompts if the
+        fused response cannot be parsed.
+        
+        Args:
+            title: Title of the Wikipedia article
+            content: Content of the Wikipedia article
+            num_scenes: Number of scene prompts (also the storyline's target scene count)
+            comic_style: Selected comic art style
+            educational_level: Storyline education level (as for generate_comic_storyline)
+            education_level: Scene prompt education level (as for generate_scene_prompts)
+            (remaining arguments as for generate_comic_storyline / generate_scene_prompts)
+            
+        Returns:
+            Dict with 'storyline' (str) and 'scene_prompts' (List[str])
+        """
+        logger.info(f"Generating storyline and {num_scenes} scene prompts for: {title} in one call")
+        
+        system_message, storyline_prompt = self._build_storyline_messages(
+            title, content, target_length, max_chars, tone, target_audience,
+            complexity, focus_style, num_scenes, educational_level, visual_style
+        )
+        scene_prompt = self._build_scene_prompt(
+            title, "[The storyline you write in PART 1 of this response]", comic_style,
+            num_scenes, age_group, education_level, negative_concepts, character_sheet,
+            style_sheet, visual_detail, camera_style, color_palette, scene_pacing
+        )
+        
+        prompt = f"""
+        This task has two parts. Complete both in a single response.
+        
+        PART 1 - STORYLINE:
+        {storyline_prompt}
+        
+        PART 2 - SCENE PROMPTS:
+        {scene_prompt}
+        
+        RESPONSE FORMAT (STRICT JSON, NO OTHER TEXT):
+        {{"storyline": "<the complete PART 1 storyline in its markdown format>", "scene_prompts": ["<scene 1 in the PART 2 output format>", "<scene 2>", ...]}}
+        The "scene_prompts" array must contain EXACTLY {num_scenes} strings, each starting with "Scene <number>:".
+        """
+        
+        try:
+            response = self.client.chat.completions.create(
+                messages=[
+                    {"role": "system", "content": system_message},
+                    {"role": "user", "content": prompt}
+                ],
+                model="llama-3.3-70b-versatile",
+                temperature=0.4,
+                max_tokens=16000,
+                top_p=0.9,
+                response_format={"type": "json_object"}
+            )
+            
+            data = json.loads(response.choices[0].message.content)
+            storyline = data.get("storyline")
+            raw_prompts = data.get("scene_prompts")
+            if not isinstance(storyline, str) or not storyline.strip() or not isinstance(raw_prompts, list):
+                raise ValueError("response is missing 'storyline' or 'scene_prompts'")
+            
+        except Exception as e:
+            logger.warning(f"Fused storyline generation failed ({str(e)}), falling back to separate calls")
+            storyline = self.generate_comic_storyline(
+                title=title,
+                content=content,
+                target_length=target_length,
+                max_chars=max_chars,
+                tone=tone,
+                target_audience=target_audience,
+                complexity=complexity,
+                focus_style=focus_style,
+                scene_count=num_scenes,
+                educational_level=educational_level,
+                visual_style=visual_style
+            )
+            scene_prompts = self.generate_scene_prompts(
+                title=title,
+                storyline=storyline,
+                comic_style=comic_style,
+                num_scenes=num_scenes,
+                age_group=age_group,
+                education_level=education_level,
+                negative_concepts=negative_concepts,
+                character_sheet=character_sheet,
+                style_sheet=style_sheet,
+                visual_detail=visual_detail,
+                camera_style=camera_style,
+                color_palette=color_palette,
+                scene_pacing=scene_pacing
+            )
+            return {"storyline": storyline, "scene_prompts": scene_prompts}
+        
+        scene_prompts = self._clean_scene_prompts(
+            [str(p) for p in raw_prompts], num_scenes, title, comic_style, age_group
+        )
+        logger.info(f"Successfully generated storyline and {len(scene_prompts)} scene prompts for: {title}")
+        return {"storyline": storyline, "scene_prompts": scene_prompts}
+    
+    def _build_storyline_messages(
+        self,
+        title: str,
+        content: str,
+        target_length: str,
+        max_chars: int,
+        tone: str,
+        target_audience: str,
+        complexity: str,
+        focus_style: str,
+        scene_count: int,
+        educational_level: str,
+        visual_style: str
+    ) -> Tuple[str, str]:
+        """Build the (system message, user prompt) pair for storyline generation"""
         # Map target length to word count
         length_map = {
             "very short": 300,
@@ -254,73 +583,37 @@ class StoryService:
         Create a storyline that is comprehensive, engaging, and provides everything needed for detailed scene generation and narration. Cover the entire story from beginning to end with depth and detail.
         """
         
-        try:
-            # Create dynamic system message based on customization
-            system_message = f"""You are an expert storyteller who creates engaging comic book storylines. 
-            You adapt your writing style based on customization parameters:
-            - Target Audience: {target_audience} - {audience_guidance.get(target_audience, "Use appropriate language")}
-            - Tone: {tone} - {tone_guidance.get(tone, "Use appropriate tone")}
-            - Complexity: {complexity} - {complexity_guidance.get(complexity, "Use appropriate detail")}
-            - Educational Level: {educational_level} - {education_guidance.get(educational_level, "Use appropriate depth")}
-            - Visual Style: {visual_style} - {visual_style_guidance.get(visual_style, "Use appropriate approach")}
-            
-            Your storylines are historically accurate but written in an engaging way that matches the specified parameters. 
-            You always follow the customization settings provided and adapt your language, depth, and style accordingly."""
-            
-            response = self.client.chat.completions.create(
-                messages=[
-                    {"role": "system", "content": system_message},
-                    {"role": "user", "content": prompt}
-                ],
-                model="llama-3.3-70b-versatile",
-                temperature=0.4,
-                max_tokens=12000,
-                top_p=0.9
-            )
-            
-            storyline = response.choices[0].message.content
-            logger.info(f"Successfully generated comic storyline for: {title}")
-            return storyline
-            
-        except Exception as e:
-            logger.error(f"Failed to generate storyline: {str(e)}")
-            raise Exception(f"Error generating storyline: {str(e)}")
+        # Create dynamic system message based on customization
+        system_message = f"""You are an expert storyteller who creates engaging comic book storylines. 
+        You adapt your writing style based on customization parameters:
+        - Target Audience: {target_audience} - {audience_guidance.get(target_audience, "Use appropriate language")}
+        - Tone: {tone} - {tone_guidance.get(tone, "Use appropriate tone")}
+        - Complexity: {complexity} - {complexity_guidance.get(complexity, "Use appropriate detail")}
+        - Educational Level: {educational_level} - {education_guidance.get(educational_level, "Use appropriate depth")}
+        - Visual Style: {visual_style} - {visual_style_guidance.get(visual_style, "Use appropriate approach")}
+        
+        Your storylines are historically accurate but written in an engaging way that matches the specified parameters. 
+        You always follow the customization settings provided and adapt your language, depth, and style accordingly."""
+        
+        return system_message, prompt
     
-    def generate_scene_prompts(
+    def _build_scene_prompt(
         self,
         title: str,
         storyline: str,
         comic_style: str,
-        num_scenes: int = 10,
-        age_group: str = "general",
-        education_level: str = "intermediate",
-        negative_concepts: List[str] = None,
-        character_sheet: str = "",
-        style_sheet: str = "",
-        visual_detail: str = "moderate",
-        camera_style: str = "varied",
-        color_palette: str = "natural",
-        scene_pacing: str = "moderate"
-    ) -> List[str]:
-        """
-        Generate scene prompts for comic panels
-        
-        Args:
-            title: Title of the article
-            storyline: Generated comic storyline
-            comic_style: Selected comic art style
-            num_scenes: Number of scene prompts
-            age_group: Target age group
-            education_level: Education level
-            negative_concepts: Concepts to avoid
-            character_sheet: Character consistency guide
-            style_sheet: Style consistency guide
-            
-        Returns:
-            List of scene prompts
-        """
-        logger.info(f"Generating {num_scenes} scene prompts for comic in {comic_style} style")
-        
+        num_scenes: int,
+        age_group: str,
+        education_level: str,
+        negative_concepts: List[str],
+        character_sheet: str,
+        style_sheet: str,
+        visual_detail: str,
+        camera_style: str,
+        color_palette: str,
+        scene_pacing: str
+    ) -> str:
+        """Build the user prompt for scene prompt generation"""
         # Style guidance
         style_guidance = {
             "manga": "Use manga-specific visual elements like speed lines, expressive emotions, and distinctive panel layouts. Character eyes should be larger, with detailed hair and simplified facial features. Use black and white with screen tones for shading.",
@@ -467,54 +760,41 @@ class StoryService:
         Produce EXACTLY {num_scenes} scenes that tell the complete story of "{title}" from beginning to end with perfect narrative flow and visual storytelling excellence.
         """
         
-        try:
-            response = self.client.chat.completions.create(
-                messages=[
-                    {"role": "system", "content": "You are an expert comic artist who creates exciting, easy-to-understand scene descriptions for STUDENTS. You use SIMPLE, CLEAR words that anyone can understand. You describe what people see in each panel using everyday language, making sure the story is exciting and easy to follow. You never use complex vocabulary - you explain things like you're talking to a friend. Your scenes flow naturally from one to the next, and you always make sure NO text appears in the images."},
-                    {"role": "user", "content": prompt}
-                ],
-                model="llama-3.3-70b-versatile",
-                temperature=0.4,
-                max_tokens=12000,
-                top_p=0.9
-            )
-            
-            scenes_text = response.choices[0].message.content
-            
-            # Process text to extract scene prompts
-            scene_prompts = []
-            scene_pattern = re.compile(r'Scene \d+:.*?(?=Scene \d+:|$)', re.DOTALL)
-            matches = scene_pattern.findall(scenes_text)
-            
-            for match in matches:
-                # Remove dialog lines
-                cleaned = re.sub(r'^\s*Dialog\s*:\s*.*$', '', match, flags=re.IGNORECASE | re.MULTILINE)
-                cleaned = re.sub(r'^\s*(Narrator|Caption|Voiceover|Voice-over|Announcer)\s*:\s*.*$', '', cleaned, flags=re.IGNORECASE | re.MULTILINE)
-                scene_prompts.append(cleaned.strip())
-            
-            # Pad if needed
-            while len(scene_prompts) < num_scenes:
-                scene_num = len(scene_prompts) + 1
-                scene_prompts.append(f"""Scene {scene_num}: Additional scene from {title}
-                Visual: A character from the story stands in a relevant setting from {title}, looking thoughtful. No on-screen text, no captions, no speech.
-                Style: {comic_style} style with appropriate elements for {age_group} audience.""")
-            
-            # Truncate if too many
-            scene_prompts = scene_prompts[:num_scenes]
-            
-            # Validate prompts
-            validated_prompts = []
-            for i, prompt in enumerate(scene_prompts):
-                # Strip dialog
-                prompt = re.sub(r'^\s*Dialog\s*:\s*.*$', '', prompt, flags=re.IGNORECASE | re.MULTILINE)
-                prompt = re.sub(r'^\s*(Narrator|Caption|Voiceover|Voice-over|Announcer)\s*:\s*.*$', '', prompt, flags=re.IGNORECASE | re.MULTILINE)
-                prompt = re.sub(r'^\s*"[^"]+"\s*$', '', prompt, flags=re.MULTILINE)
-                validated_prompts.append(prompt)
-            
-            logger.info(f"Successfully generated {len(validated_prompts)} scene prompts")
-            return validated_prompts
-            
-        except Exception as e:
-            logger.error(f"Failed to generate scene prompts: {str(e)}")
-            raise Exception(f"Error generating scene prompts: {str(e)}")
-
+        return prompt
+    
+    def _clean_scene_prompts(
+        self,
+        raw_prompts: List[str],
+        num_scenes: int,
+        title: str,
+        comic_style: str,
+        age_group: str
+    ) -> List[str]:
+        """Strip dialog lines and pad/truncate raw scene prompts to num_scenes"""
+        scene_prompts = []
+        for match in raw_prompts:
+            # Remove dialog lines
+            cleaned = re.sub(r'^\s*Dialog\s*:\s*.*$', '', match, flags=re.IGNORECASE | re.MULTILINE)
+            cleaned = re.sub(r'^\s*(Narrator|Caption|Voiceover|Voice-over|Announcer)\s*:\s*.*$', '', cleaned, flags=re.IGNORECASE | re.MULTILINE)
+            scene_prompts.append(cleaned.strip())
+        
+        # Pad if needed
+        while len(scene_prompts) < num_scenes:
+            scene_num = len(scene_prompts) + 1
+            scene_prompts.append(f"""Scene {scene_num}: Additional scene from {title}
+            Visual: A character from the story stands in a relevant setting from {title}, looking thoughtful. No on-screen text, no captions, no speech.
+            Style: {comic_style} style with appropriate elements for {age_group} audience.""")
+        
+        # Truncate if too many
+        scene_prompts = scene_prompts[:num_scenes]
+        
+        # Validate prompts
+        validated_prompts = []
+        for i, prompt in enumerate(scene_prompts):
+            # Strip dialog
+            prompt = re.sub(r'^\s*Dialog\s*:\s*.*$', '', prompt, flags=re.IGNORECASE | re.MULTILINE)
+            prompt = re.sub(r'^\s*(Narrator|Caption|Voiceover|Voice-over|Announcer)\s*:\s*.*$', '', prompt, flags=re.IGNORECASE | re.MULTILINE)
+            prompt = re.sub(r'^\s*"[^"]+"\s*$', '', prompt, flags=re.MULTILINE)
+            validated_prompts.append(prompt)
+        
+        return validated_prompts
@@ -5,12 +5,31 @@ Handles all file operations with Supabase Storage buckets
 
 import os
 import logging
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple
+from concurrent.futures import ThreadPoolExecutor
 from io import BytesIO
 from supabase import create_client, Client
+from services.response_cache import response_cache
+from utils.helpers import get_content_type
 
 logger = logging.getLogger("VidyAI_Flask")
 
+# PostgREST / Postgres error codes meaning an RPC function does not exist
+MISSING_FUNCTION_ERROR_CODES = frozenset({'PGRST202', '42883', '404'})
+
+# Optional: TUS resumable uploads for large files
+try:
+    from tusclient import client as tus_client
+except ImportError:
+    tus_client = None
+
+# Files larger than this go through the resumable (TUS) endpoint
+RESUMABLE_UPLOAD_THRESHOLD = int(os.getenv('RESUMABLE_UPLOAD_THRESHOLD', 50 * 1024 * 1024))
+# Supabase's TUS endpoint only accepts 6 MB chunks
+RESUMABLE_CHUNK_SIZE = 6 * 1024 * 1024
+# Attempts per chunk before a resumable upload gives up
+RESUMABLE_CHUNK_RETRIES = 3
+
 
 class SupabaseService:
     """Service for Supabase Storage operations"""
@@ -34,8 +53,47 @@ class SupabaseService:
             'text': os.getenv('BUCKET_TEXT', 'text')
         }
         
+        # One storage client (and so one keep-alive HTTP connection pool) for
+        # the whole process; bucket proxies are cached on first use
+        self._storage = self.client.storage
+        self._bucket_proxies: Dict[str, Any] = {}
+        self._public_url_prefixes: Dict[str, str] = {}
+        
+        # Cleared once the SQL function turns out not to be installed, so
+        # later callers skip straight to the per-folder listing
+        self._thumbnail_rpc_available = True
+        
         logger.info("SupabaseService initialized successfully")
     
+    def bucket(self, bucket_name: str):
+        """
+        Get the shared storage proxy for a bucket
+        
+        Args:
+            bucket_name: Actual bucket name (already resolved from self.buckets)
+            
+        Returns:
+            Storage bucket proxy (cached per bucket, sharing one HTTP client)
+        """
+        proxy = self._bucket_proxies.get(bucket_name)
+        if proxy is None:
+            proxy = self._bucket_proxies.setdefault(bucket_name, self._storage.from_(bucket_name))
+        return proxy
+    
+    def warm_up(self) -> None:
+        """
+        Open the pooled storage connection ahead of the first request
+        
+        Issues a one-item listing of the images bucket so the TCP and TLS
+        handshakes are paid at startup rather than by the first user request.
+        """
+        bucket_name = self.buckets['images']
+        try:
+            self.bucket(bucket_name).list('', {'limit': 1})
+            logger.info(f"Supabase storage connection warmed up ({bucket_name})")
+        except Exception as e:
+            logger.warning(f"Supabase warm-up failed: {e}")
+    
     def upload_file(self, bucket: str, path: str, file_data: bytes, content_type: Optional[str] = None) -> Dict[str, Any]:
         """
         Upload a file to Supabase Storage
@@ -49,18 +107,22 @@ class SupabaseService:
         Returns:
             Dict with upload result including public URL
         """
+        if tus_client is not None and len(file_data) > RESUMABLE_UPLOAD_THRESHOLD:
+            return self.upload_file_resumable(bucket, path, file_data, content_type)
+        
         try:
             bucket_name = self.buckets.get(bucket, bucket)
             
             # Upload file
-            response = self.client.storage.from_(bucket_name).upload(
+            response = self.bucket(bucket_name).upload(
                 path=path,
                 file=file_data,
                 file_options={"content-type": content_type} if content_type else {}
             )
             
             # Get public URL
-            public_url = self.client.storage.from_(bucket_name).get_public_url(path)
+            public_url = self.bucket(bucket_name).get_public_url(path)
+            response_cache.invalidate_bucket(bucket_name)
             
             logger.info(f"Successfully uploaded file to {bucket_name}/{path}")
             
@@ -80,6 +142,95 @@ class SupabaseService:
                 'path': path
             }
     
+    def upload_file_resumable(
+        self,
+        bucket: str,
+        path: str,
+        file_data: bytes,
+        content_type: Optional[str] = None,
+        chunk_size: int = RESUMABLE_CHUNK_SIZE
+    ) -> Dict[str, Any]:
+        """
+        Upload a file to Supabase Storage in chunks over the TUS protocol
+        
+        A chunk that fails is retried from the offset the server last
+        acknowledged, so a dropped connection costs one chunk rather than
+        the whole file. Requires the optional tuspy package.
+        
+        Args:
+            bucket: Bucket name (images, audio, video, metadata, text)
+            path: File path in bucket
+            file_data: File content as bytes
+            content_type: MIME type of file (optional)
+            chunk_size: Bytes sent per PATCH request
+            
+        Returns:
+            Dict with upload result including public URL (same shape as upload_file)
+        """
+        try:
+            if tus_client is None:
+                raise RuntimeError("tuspy is not installed; resumable uploads are unavailable")
+            
+            bucket_name = self.buckets.get(bucket, bucket)
+            metadata = {'bucketName': bucket_name, 'objectName': path}
+            if content_type:
+                metadata['contentType'] = content_type
+            
+            client = tus_client.TusClient(
+                f"{self.supabase_url.rstrip('/')}/storage/v1/upload/resumable",
+                headers={'Authorization': f"Bearer {self.supabase_key}", 'apikey': self.supabase_key}
+            )
+            uploader = client.uploader(
+                file_stream=BytesIO(file_data),
+                chunk_size=chunk_size,
+                metadata=metadata,
+                retries=RESUMABLE_CHUNK_RETRIES,
+                retry_delay=1
+            )
+            uploader.upload()
+            
+            public_url = self.bucket(bucket_name).get_public_url(path)
+            response_cache.invalidate_bucket(bucket_name)
+            
+            logger.info(f"Successfully uploaded file to {bucket_name}/{path} (resumable, {len(file_data)} bytes)")
+            
+            return {
+                'success': True,
+                'bucket': bucket_name,
+                'path': path,
+                'public_url': public_url
+            }
+            
+        except Exception as e:
+            logger.error(f"Failed resumable upload to {bucket}/{path}: {str(e)}")
+            return {
+                'success': False,
+                'error': str(e),
+                'bucket': bucket,
+                'path': path
+            }
+    
+    def upload_files(
+        self,
+        jobs: List[Tuple[str, str, bytes, Optional[str]]],
+        max_workers: int = 8
+    ) -> List[Dict[str, Any]]:
+        """
+        Upload several files concurrently
+        
+        Args:
+            jobs: List of (bucket, path, file_data, content_type) tuples
+            max_workers: Maximum number of uploads in flight
+            
+        Returns:
+            List of upload results (as returned by upload_file), in job order
+        """
+        if len(jobs) <= 1:
+            return [self.upload_file(*job) for job in jobs]
+        
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(jobs))) as executor:
+            return list(executor.map(lambda job: self.upload_file(*job), jobs))
+    
     def download_file(self, bucket: str, path: str) -> Dict[str, Any]:
         """
         Download a file from Supabase Storage
@@ -94,7 +245,7 @@ class SupabaseService:
         try:
             bucket_name = self.buckets.get(bucket, bucket)
             
-            response = self.client.storage.from_(bucket_name).download(path)
+            response = self.bucket(bucket_name).download(path)
             
             logger.info(f"Successfully downloaded file from {bucket_name}/{path}")
             return {
@@ -113,6 +264,27 @@ class SupabaseService:
                 'path': path
             }
     
+    def download_files(
+        self,
+        jobs: List[Tuple[str, str]],
+        max_workers: int = 16
+    ) -> List[Dict[str, Any]]:
+        """
+        Download several files concurrently
+        
+        Args:
+            jobs: List of (bucket, path) tuples
+            max_workers: Maximum number of downloads in flight
+            
+        Returns:
+            List of download results (as returned by download_file), in job order
+        """
+        if len(jobs) <= 1:
+            return [self.download_file(*job) for job in jobs]
+        
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(jobs))) as executor:
+            return list(executor.map(lambda job: self.download_file(*job), jobs))
+    
     def delete_file(self, bucket: str, path: str) -> Dict[str, Any]:
         """
         Delete a file from Supabase Storage
@@ -127,7 +299,8 @@ class SupabaseService:
         try:
             bucket_name = self.buckets.get(bucket, bucket)
             
-            response = self.client.storage.from_(bucket_name).remove([path])
+            response = self.bucket(bucket_name).remove([path])
+            response_cache.invalidate_bucket(bucket_name)
             
             logger.info(f"Successfully deleted file from {bucket_name}/{path}")
             
@@ -160,7 +333,7 @@ class SupabaseService:
         try:
             bucket_name = self.buckets.get(bucket, bucket)
             
-            response = self.client.storage.from_(bucket_name).list(path)
+            response = self.bucket(bucket_name).list(path)
             
             if response is None:
                 logger.warning(f"No response from Supabase for bucket {bucket_name}/{path}")
@@ -231,6 +404,58 @@ class SupabaseService:
                 'path': path
             }
     
+    def first_image_per_folder(self, bucket: str) -> Optional[Dict[str, str]]:
+        """
+        Find the first image in each top-level folder with a single SQL call
+        
+        Uses the first_image_per_folder Postgres function (see
+        RENDER_DEPLOYMENT.md) instead of listing the bucket folder by folder.
+        
+        Args:
+            bucket: Bucket name
+            
+        Returns:
+            Dict mapping folder name to image path, or None if the function is
+            unavailable (callers should fall back to list_files)
+        """
+        if not self._thumbnail_rpc_available:
+            return None
+        
+        bucket_name = self.buckets.get(bucket, bucket)
+        try:
+            response = self.client.rpc('first_image_per_folder', {'p_bucket': bucket_name}).execute()
+        except Exception as e:
+            # Only a missing function is permanent; anything else (network
+            # errors, timeouts, refused permissions) falls back for this call
+            if str(getattr(e, 'code', '')) in MISSING_FUNCTION_ERROR_CODES:
+                self._thumbnail_rpc_available = False
+                logger.warning(f"first_image_per_folder RPC not installed, using folder listing instead: {e}")
+            else:
+                logger.warning(f"first_image_per_folder RPC failed, using folder listing for this request: {e}")
+            return None
+        
+        return {row['folder']: row['name'] for row in response.data or []}
+    
+    def public_url_prefix(self, bucket: str) -> str:
+        """
+        Get the public URL prefix for a bucket
+        
+        Appending a URL-quoted file path gives that file's public URL, which
+        avoids a get_public_url call per file when building many URLs.
+        
+        Args:
+            bucket: Bucket name
+            
+        Returns:
+            Prefix ending in '/'
+        """
+        bucket_name = self.buckets.get(bucket, bucket)
+        prefix = self._public_url_prefixes.get(bucket_name)
+        if prefix is None:
+            prefix = self.bucket(bucket_name).get_public_url('').rstrip('?').rstrip('/') + '/'
+            self._public_url_prefixes[bucket_name] = prefix
+        return prefix
+    
     def get_public_url(self, bucket: str, path: str) -> Optional[str]:
         """
         Get public URL for a file
@@ -244,12 +469,61 @@ class SupabaseService:
         """
         try:
             bucket_name = self.buckets.get(bucket, bucket)
-            public_url = self.client.storage.from_(bucket_name).get_public_url(path)
+            public_url = self.bucket(bucket_name).get_public_url(path)
             return public_url
         except Exception as e:
             logger.error(f"Failed to get public URL for {bucket}/{path}: {str(e)}")
             return None
     
+    def create_signed_url(self, bucket: str, path: str, expires_in: int = 300) -> Optional[str]:
+        """
+        Create a time-limited download URL for a file
+        
+        Args:
+            bucket: Bucket name
+            path: File path in bucket
+            expires_in: Seconds until the URL expires
+            
+        Returns:
+            Signed URL string or None
+        """
+        try:
+            bucket_name = self.buckets.get(bucket, bucket)
+            response = self.bucket(bucket_name).create_signed_url(path, expires_in)
+            return response.get('signedURL') or response.get('signedUrl')
+        except Exception as e:
+            logger.error(f"Failed to create signed URL for {bucket}/{path}: {str(e)}")
+            return None
+    
+    def create_signed_upload_url(self, bucket: str, path: str) -> Optional[Dict[str, str]]:
+        """
+        Create a signed URL the client can upload a file to directly
+        
+        The upload bypasses this server, so cached listings of the bucket are
+        dropped now; anything recomputed before the client finishes uploading
+        expires with the response cache TTL.
+        
+        Args:
+            bucket: Bucket name
+            path: Destination path in bucket
+            
+        Returns:
+            Dict with 'url', 'token', 'path' and 'public_url', or None
+        """
+        try:
+            bucket_name = self.buckets.get(bucket, bucket)
+            response = self.bucket(bucket_name).create_signed_upload_url(path)
+            response_cache.invalidate_bucket(bucket_name)
+            return {
+                'url': response.get('signed_url') or response.get('signedUrl'),
+                'token': response.get('token'),
+                'path': response.get('path', path),
+                'public_url': self.get_public_url(bucket_name, path)
+            }
+        except Exception as e:
+            logger.error(f"Failed to create signed upload URL for {bucket}/{path}: {str(e)}")
+            return None
+    
     def upload_from_local_file(self, bucket: str, path: str, local_file_path: str) -> Dict[str, Any]:
         """
         Upload a local file to Supabase Storage
@@ -267,7 +541,7 @@ class SupabaseService:
                 file_data = f.read()
             
             # Detect content type from file extension
-            content_type = self._get_content_type(local_file_path)
+            content_type = get_content_type(local_file_path)
             
             return self.upload_file(bucket, path, file_data, content_type)
             
@@ -278,28 +552,6 @@ class SupabaseService:
                 'error': str(e),
                 'local_file': local_file_path
             }
-    
-    def _get_content_type(self, file_path: str) -> str:
-        """Get MIME type from file extension"""
-        ext = os.path.splitext(file_path)[1].lower()
-        
-        content_types = {
-            '.jpg': 'image/jpeg',
-            '.jpeg': 'image/jpeg',
-            '.png': 'image/png',
-            '.gif': 'image/gif',
-            '.webp': 'image/webp',
-            '.mp3': 'audio/mpeg',
-            '.wav': 'audio/wav',
-            '.mp4': 'video/mp4',
-            '.avi': 'video/x-msvideo',
-            '.mov': 'video/quicktime',
-            '.json': 'application/json',
-            '.txt': 'text/plain',
-            '.md': 'text/markdown'
-        }
-        
-        return content_types.get(ext, 'application/octet-stream')
 
 
 # Create singleton instance
@@ -0,0 +1,74 @@
+"""
+TTS Cache
+In-process LRU cache of synthesized MP3 audio keyed by text and voice settings
+"""
+
+import os
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+logger = logging.getLogger("VidyAI_Flask")
+
+
+class TTSCache:
+    """Thread-safe LRU cache mapping a TTS request to its MP3 bytes"""
+
+    def __init__(self, maxsize: int = 256):
+        """
+        Initialize TTS Cache
+
+        Args:
+            maxsize: Maximum number of cached clips (0 disables caching)
+        """
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+        logger.info(f"TTSCache initialized (maxsize={maxsize})")
+
+    @staticmethod
+    def make_key(text: str, lang: str, tld: str, slow: bool, speed: float) -> str:
+        """
+        Build the cache key for a synthesis request
+
+        Args:
+            text: Text to convert to speech
+            lang: Language code
+            tld: Top-level domain for accent
+            slow: Whether slower speech is used
+            speed: Speed multiplier
+
+        Returns:
+            Hex digest identifying the request
+        """
+        raw = f"{text}|{lang}|{tld}|{slow}|{speed}".encode('utf-8')
+        return hashlib.blake2b(raw, digest_size=16).hexdigest()
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return cached audio for key (marking it most recently used), or None"""
+        with self._lock:
+            audio_data = self._entries.get(key)
+            if audio_data is not None:
+                self._entries.move_to_end(key)
+            return audio_data
+
+    def put(self, key: str, audio_data: bytes) -> None:
+        """Store audio for key, evicting the least recently used clips if full"""
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = audio_data
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all cached audio"""
+        with self._lock:
+            self._entries.clear()
+
+
+# Create cache instance
+tts_cache = TTSCache(maxsize=int(os.getenv('TTS_CACHE_SIZE', 256)))
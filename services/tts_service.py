@@ -5,9 +5,11 @@ Handles audio generation from narration text using Google TTS
 
 import os
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Iterator, List, NamedTuple
 from gtts import gTTS
 from io import BytesIO
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from services.tts_cache import tts_cache
 
 logger = logging.getLogger("VidyAI_Flask")
 
@@ -19,6 +21,25 @@ except ImportError:
     logger.warning("pydub not installed. Audio speed adjustment will not be available.")
     PYDUB_AVAILABLE = False
 
+# Concurrent gTTS requests per batch; kept modest to avoid Google throttling
+TTS_MAX_WORKERS = 6
+
+
+class SceneAudio(NamedTuple):
+    """Synthesized audio for one scene"""
+    key: str
+    scene_number: Optional[int]
+    audio: bytes
+
+
+def _scene_number(scene_key: str, scene_data: Dict[str, Any]) -> Optional[int]:
+    """Scene number from its narration data or a "scene_<n>" key, or None (e.g. for "intro")"""
+    value = scene_data.get("scene_number") or scene_key.rpartition('_')[2]
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
 
 class TTSService:
     """Service for text-to-speech conversion"""
@@ -89,6 +110,13 @@ class TTSService:
         Returns:
             Audio data as bytes
         """
+        # Identical requests (e.g. scene retries) are served from the cache
+        cache_key = tts_cache.make_key(text, lang, tld, slow, speed)
+        cached = tts_cache.get(cache_key)
+        if cached is not None:
+            logger.info("Using cached TTS audio")
+            return cached
+        
         try:
             # Generate TTS
             tts = gTTS(text=text, lang=lang, tld=tld, slow=slow)
@@ -105,6 +133,7 @@ class TTSService:
             if speed != 1.0 and abs(speed - 1.0) > 0.01:
                 audio_data = self.adjust_audio_speed(audio_data, speed)
             
+            tts_cache.put(cache_key, audio_data)
             return audio_data
             
         except Exception as e:
@@ -127,6 +156,76 @@ class TTSService:
         adjusted_duration = base_duration / speed if speed > 0 else base_duration
         return max(0.0, adjusted_duration)
     
+    def _synthesize_scene(
+        self,
+        scene_data: Dict[str, Any],
+        lang: str,
+        tld: str,
+        slow: bool,
+        speed: float
+    ) -> Optional[bytes]:
+        """Synthesize one scene's narration, returning None if it is empty or fails"""
+        scene_num = scene_data.get("scene_number")
+        text = scene_data.get("narration", "").strip()
+        
+        if not text:
+            logger.warning(f"No narration text for scene {scene_num}")
+            return None
+        
+        try:
+            audio_data = self.synthesize_to_mp3(text, lang, tld, slow, speed)
+            
+            duration = self.estimate_tts_duration_seconds(text, speed)
+            logger.info(f"Generated audio for scene {scene_num} (~{duration:.1f}s at {speed}x speed)")
+            return audio_data
+            
+        except Exception as e:
+            logger.error(f"✗ Error generating audio for scene {scene_num}: {str(e)}")
+            return None
+    
+    def iter_scene_audios(
+        self,
+        narrations: Dict[str, Any],
+        lang: str = "en",
+        tld: str = "com",
+        slow: bool = False,
+        speed: float = 1.25,
+        max_workers: int = TTS_MAX_WORKERS
+    ) -> Iterator[SceneAudio]:
+        """
+        Generate audio for all scenes concurrently, yielding each result as soon as it is ready
+        
+        Args:
+            narrations: Dictionary with narration data
+            lang: Language code
+            tld: Top-level domain for accent
+            slow: Whether to use slower speech
+            speed: Speed multiplier
+            max_workers: Maximum concurrent gTTS requests
+            
+        Yields:
+            SceneAudio for every scene that synthesized successfully, in completion order
+            (scene_number is None when neither the data nor the key gives one)
+        """
+        narrs = narrations.get("narrations", {})
+        logger.info(f"Generating audio for {len(narrs)} scenes at {speed}x speed")
+        if not narrs:
+            return
+        
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(narrs))) as executor:
+            futures = {
+                executor.submit(self._synthesize_scene, scene_data, lang, tld, slow, speed): (
+                    scene_key,
+                    _scene_number(scene_key, scene_data)
+                )
+                for scene_key, scene_data in narrs.items()
+            }
+            for future in as_completed(futures):
+                audio_data = future.result()
+                if audio_data is not None:
+                    scene_key, scene_number = futures[future]
+                    yield SceneAudio(scene_key, scene_number, audio_data)
+    
     def generate_scene_audios(
         self,
         narrations: Dict[str, Any],
@@ -134,7 +233,7 @@ class TTSService:
         tld: str = "com",
         slow: bool = False,
         speed: float = 1.25
-    ) -> Dict[str, bytes]:
+    ) -> List[SceneAudio]:
         """
         Generate audio for all scenes
         
@@ -146,34 +245,13 @@ class TTSService:
             speed: Speed multiplier
             
         Returns:
-            Dictionary mapping scene keys to audio bytes
+            List of SceneAudio records, in narration order
         """
-        logger.info(f"Generating audio for {len(narrations.get('narrations', {}))} scenes at {speed}x speed")
-        
-        scene_to_audio = {}
         narrs = narrations.get("narrations", {})
-        
-        for scene_key, scene_data in narrs.items():
-            scene_num = scene_data.get("scene_number")
-            text = scene_data.get("narration", "").strip()
-            
-            if not text:
-                logger.warning(f"No narration text for scene {scene_num}")
-                continue
-            
-            try:
-                audio_data = self.synthesize_to_mp3(text, lang, tld, slow, speed)
-                scene_to_audio[scene_key] = audio_data
-                
-                duration = self.estimate_tts_duration_seconds(text, speed)
-                logger.info(f"Generated audio for scene {scene_num} (~{duration:.1f}s at {speed}x speed)")
-                
-            except Exception as e:
-                logger.error(f"✗ Error generating audio for scene {scene_num}: {str(e)}")
-                continue
-        
-        logger.info(f"Successfully generated {len(scene_to_audio)}/{len(narrs)} audio files")
-        return scene_to_audio
+        results = {rec.key: rec for rec in self.iter_scene_audios(narrations, lang, tld, slow, speed)}
+        scene_audios = [results[scene_key] for scene_key in narrs if scene_key in results]
+        logger.info(f"Successfully generated {len(scene_audios)}/{len(narrs)} audio files")
+        return scene_audios
 
 
 # Create service instance
@@ -0,0 +1,103 @@
+"""
+Upload Job Service
+Runs Supabase uploads on a background thread pool and tracks their status
+"""
+
+import os
+import time
+import uuid
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional
+from services.supabase_service import supabase_service
+
+logger = logging.getLogger("VidyAI_Flask")
+
+
+class UploadJobQueue:
+    """Thread-safe registry of background uploads"""
+
+    def __init__(self, max_workers: int = 4, max_pending: int = 16, max_age_seconds: int = 3600):
+        """
+        Initialize Upload Job Queue
+
+        Args:
+            max_workers: Maximum number of uploads running at once
+            max_pending: Maximum number of unfinished uploads (running or queued);
+                each holds its whole file in memory
+            max_age_seconds: How long finished jobs stay queryable
+        """
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="upload")
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._pending = 0
+        self.max_pending = max_pending
+        self.max_age_seconds = max_age_seconds
+        logger.info(f"UploadJobQueue initialized (max_workers={max_workers}, max_pending={max_pending})")
+
+    def submit(self, bucket: str, path: str, file_data: bytes, content_type: Optional[str] = None) -> Optional[str]:
+        """
+        Queue an upload
+
+        Args:
+            bucket: Bucket name
+            path: File path in bucket
+            file_data: File content as bytes
+            content_type: MIME type of file (optional)
+
+        Returns:
+            Job ID for get_status(), or None if max_pending uploads are already queued
+        """
+        job_id = uuid.uuid4().hex
+        with self._lock:
+            if self._pending >= self.max_pending:
+                return None
+            self._pending += 1
+            self._cleanup_old()
+            self._jobs[job_id] = {
+                "status": "pending",
+                "bucket": bucket,
+                "path": path,
+                "result": None,
+                "timestamp": time.time()
+            }
+        self._executor.submit(self._run, job_id, bucket, path, file_data, content_type)
+        return job_id
+
+    def _run(self, job_id: str, bucket: str, path: str, file_data: bytes, content_type: Optional[str]):
+        """Perform one upload and record its result"""
+        try:
+            result = supabase_service.upload_file(bucket, path, file_data, content_type)
+        except Exception as e:
+            result = {'success': False, 'error': str(e), 'bucket': bucket, 'path': path}
+        with self._lock:
+            self._pending -= 1
+            job = self._jobs.get(job_id)
+            if job is not None:
+                job["status"] = "completed" if result.get("success") else "failed"
+                job["result"] = result
+                job["timestamp"] = time.time()
+
+    def get_status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Get a copy of a job's status, or None if unknown or expired"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job is not None else None
+
+    def _cleanup_old(self):
+        """Forget finished jobs older than max_age_seconds (caller holds the lock)"""
+        cutoff = time.time() - self.max_age_seconds
+        stale = [
+            job_id for job_id, job in self._jobs.items()
+            if job["status"] != "pending" and job["timestamp"] < cutoff
+        ]
+        for job_id in stale:
+            del self._jobs[job_id]
+
+
+# Create queue instance
+upload_jobs = UploadJobQueue(
+    max_workers=int(os.getenv('UPLOAD_WORKERS', 4)),
+    max_pending=int(os.getenv('UPLOAD_MAX_PENDING', 16))
+)
@@ -8,7 +8,7 @@ import re
 import time
 import logging
 import tempfile
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Tuple, Union
 import numpy as np
 from PIL import Image
 from io import BytesIO
@@ -313,47 +313,49 @@ class VideoService:
 
         return "\n".join(lines)
     
-    def _get_audio_duration_seconds(self, audio_data: bytes) -> float:
-        """Get audio duration from bytes"""
+    def _get_audio_duration_seconds(self, audio_data: Union[bytes, str]) -> float:
+        """Get audio duration from bytes or an audio file path"""
         # Try pydub first
         try:
             from pydub import AudioSegment
-            seg = AudioSegment.from_file(BytesIO(audio_data))
+            seg = AudioSegment.from_file(audio_data if isinstance(audio_data, str) else BytesIO(audio_data))
             duration = seg.duration_seconds
             if duration > 0:
                 return duration
         except Exception as e:
             logger.debug(f"Pydub failed to get audio duration: {e}")
         
-        # Fallback: Try MoviePy (requires saving to temp file)
+        # Fallback: Try MoviePy (bytes are saved to a temp file first)
         try:
-            with tempfile.NamedTemporaryFile(suffix='.mp3', delete=False) as tmp:
-                tmp.write(audio_data)
-                tmp_path = tmp.name
+            if isinstance(audio_data, str):
+                tmp_path = None
+                audio_path = audio_data
+            else:
+                with tempfile.NamedTemporaryFile(suffix='.mp3', delete=False) as tmp:
+                    tmp.write(audio_data)
+                    tmp_path = tmp.name
+                audio_path = tmp_path
             
             try:
                 if MOVIEPY_VERSION == 2:
-                    with AudioFileClip(tmp_path) as audio:
+                    with AudioFileClip(audio_path) as audio:
                         duration = audio.duration
                 else:
-                    audio = mpe.AudioFileClip(tmp_path)
+                    audio = mpe.AudioFileClip(audio_path)
                     duration = audio.duration
                     audio.close()
                 
-                # Cleanup
-                try:
-                    os.unlink(tmp_path)
-                except:
-                    pass
-                
                 if duration and duration > 0:
                     return duration
             except Exception as e:
                 logger.debug(f"MoviePy failed to get audio duration: {e}")
-                try:
-                    os.unlink(tmp_path)
-                except:
-                    pass
+            finally:
+                # Cleanup
+                if tmp_path:
+                    try:
+                        os.unlink(tmp_path)
+                    except:
+                        pass
         except Exception:
             pass
         
@@ -433,8 +435,8 @@ class VideoService:
     
     def build_video(
         self,
-        images: List[bytes],
-        scene_audio: Dict[str, bytes],
+        images: List[Union[bytes, str]],
+        scene_audio: Dict[str, Union[bytes, str]],
         title: str,
         fps: int = 30,
         resolution: Tuple[int, int] = (1920, 1080),
@@ -442,7 +444,7 @@ class VideoService:
         min_scene_seconds: float = 2.0,
         head_pad: float = 0.15,
         tail_pad: float = 0.15,
-        bg_music_data: Optional[bytes] = None,
+        bg_music_data: Optional[Union[bytes, str]] = None,
         bg_music_volume: float = 0.08,
         ken_burns: bool = True,
         kb_zoom_start: float = 1.05,
@@ -458,8 +460,8 @@ class VideoService:
         Build video from images and audio
         
         Args:
-            images: List of image data (bytes)
-            scene_audio: Dict mapping scene keys to audio bytes
+            images: List of image data (bytes) or image file paths (used in place)
+            scene_audio: Dict mapping scene keys to audio bytes or audio file paths (used in place)
             title: Video title
             fps: Frame rate
             resolution: Video resolution
@@ -467,7 +469,7 @@ class VideoService:
             min_scene_seconds: Minimum scene duration
             head_pad: Audio head padding
             tail_pad: Audio tail padding
-            bg_music_data: Background music bytes
+            bg_music_data: Background music bytes or file path
             bg_music_volume: Background music volume
             ken_burns: Enable Ken Burns effect
             kb_zoom_start: Ken Burns start zoom
@@ -616,10 +618,13 @@ class VideoService:
                     actual_audio_duration = audio_durations[idx] if idx < len(audio_durations) else 0.0
                     
                     try:
-                        # Save image temporarily
-                        img_path = os.path.join(temp_dir, f"scene_{scene_num}.jpg")
-                        with open(img_path, 'wb') as f:
-                            f.write(img_data)
+                        # Image paths are read by MoviePy directly; bytes are saved temporarily
+                        if isinstance(img_data, str):
+                            img_path = img_data
+                        else:
+                            img_path = os.path.join(temp_dir, f"scene_{scene_num}.jpg")
+                            with open(img_path, 'wb') as f:
+                                f.write(img_data)
                         
                         # Create image clip
                         if MOVIEPY_VERSION == 2:
@@ -649,9 +654,13 @@ class VideoService:
                         # Add audio - trim to scene duration to prevent overlapping
                         if audio_data:
                             try:
-                                audio_path = os.path.join(temp_dir, f"scene_{scene_num}.mp3")
-                                with open(audio_path, 'wb') as f:
-                                    f.write(audio_data)
+                                # Audio paths are read directly; bytes are saved temporarily
+                                if isinstance(audio_data, str):
+                                    audio_path = audio_data
+                                else:
+                                    audio_path = os.path.join(temp_dir, f"scene_{scene_num}.mp3")
+                                    with open(audio_path, 'wb') as f:
+                                        f.write(audio_data)
                                 
                                 if MOVIEPY_VERSION == 2:
                                     narr = AudioFileClip(audio_path)
@@ -754,9 +763,12 @@ class VideoService:
                         # Add background music if provided
                         if bg_music_data:
                             try:
-                                music_path = os.path.join(temp_dir, "bg_music.mp3")
-                                with open(music_path, 'wb') as f:
-                                    f.write(bg_music_data)
+                                if isinstance(bg_music_data, str):
+                                    music_path = bg_music_data
+                                else:
+                                    music_path = os.path.join(temp_dir, "bg_music.mp3")
+                                    with open(music_path, 'wb') as f:
+                                        f.write(bg_music_data)
                                 
                                 if MOVIEPY_VERSION == 2:
                                     music = AudioFileClip(music_path)
@@ -900,6 +912,7 @@ class VideoService:
             except Exception as e:
                 # Cleanup on error - close all clips
                 logger.error(f"Error building video: {e}")
+                progress_tracker.fail_progress(task_id, str(e))
                 
                 for audio_track in audio_tracks:
                     try:
@@ -0,0 +1,4 @@
+"""
+Unit tests for the VidyAI Flask backend
+Run with: python -m unittest discover -s tests -t .
+"""
@@ -0,0 +1,101 @@
+"""
+Progress stream tests
+Each test drives _progress_events against its own ProgressTracker
+"""
+
+import json
+import unittest
+from unittest import mock
+
+from flask import Flask
+
+import routes.progress_routes as progress_routes
+from services.progress_service import ProgressTracker
+
+
+def decode_event(chunk: bytes) -> dict:
+    """Parse one 'data: {...}' SSE event"""
+    return json.loads(chunk[len(b"data: "):])
+
+
+class ProgressStreamTest(unittest.TestCase):
+    """The stream must always end, whatever happens to its task"""
+
+    def setUp(self):
+        self.tracker = ProgressTracker()
+        patcher = mock.patch.object(progress_routes, 'progress_tracker', self.tracker)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_closes_after_completion(self):
+        self.tracker.set_progress('video_T', 100, "Video generation complete!", 3, 3)
+        events = [decode_event(chunk) for chunk in progress_routes._progress_events('video_T')]
+        self.assertEqual(events, [{'progress': 100, 'message': "Video generation complete!", 'current': 3, 'total': 3}])
+
+    def test_closes_on_failure(self):
+        self.tracker.set_progress('video_T', 40, "Processing scene 2", 2, 3)
+        self.tracker.fail_progress('video_T', "ffmpeg exited with status 1")
+        events = [decode_event(chunk) for chunk in progress_routes._progress_events('video_T')]
+        self.assertEqual(len(events), 1)
+        self.assertEqual(events[0]['progress'], 40)
+        self.assertEqual(events[0]['error'], "ffmpeg exited with status 1")
+
+    def test_closes_when_cleared(self):
+        self.tracker.set_progress('video_T', 10, "Initializing video build...", 0, 3)
+        stream = progress_routes._progress_events('video_T')
+        self.assertEqual(decode_event(next(stream))['progress'], 10)
+
+        self.tracker.clear_progress('video_T')
+        self.assertEqual(decode_event(next(stream))['error'], 'Task cleared')
+        self.assertEqual(list(stream), [])
+
+    def test_unknown_task_times_out_with_terminal_event(self):
+        with mock.patch.object(progress_routes, 'STREAM_IDLE_SECONDS', 0):
+            events = [decode_event(chunk) for chunk in progress_routes._progress_events('video_typo')]
+        self.assertEqual(len(events), 1)
+        self.assertEqual(events[0]['error'], 'Task not found')
+
+    def test_stalled_task_times_out(self):
+        self.tracker.set_progress('video_T', 70, "Combining audio tracks...", 3, 3)
+        with mock.patch.object(progress_routes, 'STREAM_IDLE_SECONDS', 0):
+            events = [decode_event(chunk) for chunk in progress_routes._progress_events('video_T')]
+        self.assertEqual([event['progress'] for event in events], [70, 70])
+        self.assertIn('error', events[-1])
+
+
+
+class GetProgressETagTest(unittest.TestCase):
+    """GET /api/progress/get ETags must survive a restart"""
+
+    def setUp(self):
+        app = Flask(__name__)
+        app.register_blueprint(progress_routes.progress_bp, url_prefix='/api/progress')
+        self.client = app.test_client()
+
+    def poll(self, tracker, etag=None):
+        headers = {'If-None-Match': etag} if etag else {}
+        with mock.patch.object(progress_routes, 'progress_tracker', tracker):
+            return self.client.get('/api/progress/get?task_id=video_T', headers=headers)
+
+    def test_unchanged_progress_is_not_modified(self):
+        tracker = ProgressTracker()
+        tracker.set_progress('video_T', 40, "Processing scene 2", 2, 3)
+        etag = self.poll(tracker).headers['ETag']
+        self.assertEqual(self.poll(tracker, etag).status_code, 304)
+
+    def test_restarted_tracker_does_not_reuse_etag(self):
+        # Two trackers stand in for a worker before and after a restart:
+        # both start counting versions from zero
+        before, after = ProgressTracker(), ProgressTracker()
+        before.set_progress('video_T', 40, "Processing scene 2", 2, 3)
+        after.set_progress('video_T', 10, "Initializing video build...", 0, 3)
+
+        etag = self.poll(before).headers['ETag']
+        response = self.poll(after, etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()['progress'], 10)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,38 @@
+"""
+ResponseCache tests
+"""
+
+import unittest
+
+from services.response_cache import ResponseCache
+
+
+class ResponseCacheETagTest(unittest.TestCase):
+    """ETags must identify the body, not the order entries were stored in"""
+
+    def test_separate_caches_tag_different_bodies_differently(self):
+        # Two caches stand in for a worker before and after a restart
+        before, after = ResponseCache(ttl=60), ResponseCache(ttl=60)
+        etag_before = before.put('thumbnails:images', 'images', b'{"count":1}')
+        etag_after = after.put('thumbnails:images', 'images', b'{"count":2}')
+        self.assertNotEqual(etag_before, etag_after)
+
+    def test_same_body_keeps_its_etag(self):
+        before, after = ResponseCache(ttl=60), ResponseCache(ttl=60)
+        after.put('other', 'images', b'{"count":0}')
+        self.assertEqual(
+            before.put('thumbnails:images', 'images', b'{"count":1}'),
+            after.put('thumbnails:images', 'images', b'{"count":1}')
+        )
+
+    def test_get_returns_stored_body_and_etag(self):
+        cache = ResponseCache(ttl=60)
+        etag = cache.put('thumbnails:images', 'images', b'{"count":1}')
+        self.assertEqual(cache.get('thumbnails:images'), (etag, b'{"count":1}'))
+
+        cache.invalidate_bucket('images')
+        self.assertIsNone(cache.get('thumbnails:images'))
+
+
+if __name__ == '__main__':
+    unittest.main()
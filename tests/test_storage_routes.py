@@ -0,0 +1,68 @@
+"""
+Storage route tests
+services.supabase_service is replaced by a stub while the routes are imported,
+so no Supabase project or credentials are needed
+"""
+
+import base64
+import os
+import sys
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from flask import Flask
+
+supabase_stub = mock.MagicMock()
+with mock.patch.dict(sys.modules, {'services.supabase_service': SimpleNamespace(supabase_service=supabase_stub)}):
+    import routes.storage_routes as storage_routes
+
+
+# Captured before any test patches it
+DEFAULT_B64_LIMIT = storage_routes.MAX_UPLOAD_B64_LENGTH
+
+
+class UploadFileLimitTest(unittest.TestCase):
+    """POST /api/storage/upload rejects base64 payloads over MAX_UPLOAD_B64_LENGTH"""
+
+    def setUp(self):
+        app = Flask(__name__)
+        app.config['MAX_CONTENT_LENGTH'] = 104857600
+        app.register_blueprint(storage_routes.storage_bp, url_prefix='/api/storage')
+        self.client = app.test_client()
+        supabase_stub.reset_mock()
+        supabase_stub.upload_file.return_value = {
+            'success': True, 'bucket': 'images', 'path': 'a.png', 'public_url': 'https://cdn/a.png'
+        }
+        patcher = mock.patch.object(storage_routes, 'MAX_UPLOAD_B64_LENGTH', 8)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def upload(self, raw: bytes):
+        return self.client.post('/api/storage/upload', json={
+            'bucket': 'images',
+            'path': 'a.png',
+            'file_data': base64.b64encode(raw).decode()
+        })
+
+    @unittest.skipIf('MAX_UPLOAD_B64_LENGTH' in os.environ, 'limit overridden by environment')
+    def test_default_limit_is_below_request_cap(self):
+        # Otherwise Flask's 413 always fires first and the guard is dead code
+        self.assertLess(DEFAULT_B64_LIMIT, 104857600)
+
+    def test_at_limit_is_uploaded(self):
+        response = self.upload(b'123456')  # 8 base64 characters
+
+        self.assertEqual(response.status_code, 200)
+        supabase_stub.upload_file.assert_called_once_with('images', 'a.png', b'123456', None)
+
+    def test_over_limit_is_rejected(self):
+        response = self.upload(b'1234567')  # 12 base64 characters
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.get_json()['error'], 'file_data exceeds 8 base64 characters')
+        supabase_stub.upload_file.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
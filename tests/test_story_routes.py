@@ -0,0 +1,50 @@
+"""
+Story route tests
+The shared StoryService is swapped for one backed by a scripted Groq client
+"""
+
+import json
+import unittest
+from unittest import mock
+
+from flask import Flask
+
+import routes.story_routes as story_routes
+from tests.test_story_service import make_story_service
+
+
+class GenerateCompleteBatchTest(unittest.TestCase):
+    """POST /api/story/generate-complete-batch"""
+
+    def setUp(self):
+        app = Flask(__name__)
+        app.register_blueprint(story_routes.story_bp, url_prefix='/api/story')
+        self.client = app.test_client()
+
+    def test_successful_item(self):
+        fused = json.dumps({
+            "storyline": "# Volcanoes\n\nA story about volcanoes.",
+            "scene_prompts": ["Scene 1: A mountain.", "Scene 2: Lava flows."]
+        })
+        service = make_story_service([fused])
+
+        with mock.patch.object(story_routes, '_story_service', service):
+            response = self.client.post('/api/story/generate-complete-batch', json={
+                "items": [{"title": "Volcanoes", "content": "Volcanoes erupt."}],
+                "num_scenes": 2,
+                "education_level": "advanced"
+            })
+
+        self.assertEqual(response.status_code, 200)
+        body = response.get_json()
+        self.assertTrue(body['success'])
+        item = body['results'][0]
+        self.assertTrue(item['success'], item.get('error'))
+        self.assertEqual(item['title'], "Volcanoes")
+        self.assertEqual(item['storyline'], "# Volcanoes\n\nA story about volcanoes.")
+        self.assertEqual(item['scene_prompts'], ["Scene 1: A mountain.", "Scene 2: Lava flows."])
+        self.assertEqual(item['num_scenes'], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+"""
+StoryService tests
+Groq is replaced by a scripted client, so no API key or network is needed
+"""
+
+import json
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from services.story_service import StoryService
+
+
+class ScriptedGroqClient:
+    """Stands in for groq.Groq: returns the given message contents in order"""
+
+    def __init__(self, contents):
+        self._contents = list(contents)
+        self.calls = []
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    def _create(self, **kwargs):
+        self.calls.append(kwargs)
+        message = SimpleNamespace(content=self._contents.pop(0))
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+def make_story_service(contents) -> StoryService:
+    """StoryService whose Groq client replays contents"""
+    service = StoryService.__new__(StoryService)
+    service.client = ScriptedGroqClient(contents)
+    return service
+
+
+class GenerateStorylineAndPromptsTest(unittest.TestCase):
+    """generate_storyline_and_prompts with a stubbed Groq client"""
+
+    def test_fused_call(self):
+        fused = json.dumps({
+            "storyline": "# Volcanoes\n\nA story about volcanoes.",
+            "scene_prompts": ["Scene 1: A mountain.", "Scene 2: Lava flows."]
+        })
+        service = make_story_service([fused])
+
+        with mock.patch.object(service, '_build_storyline_messages', wraps=service._build_storyline_messages) as storyline_builder, \
+                mock.patch.object(service, '_build_scene_prompt', wraps=service._build_scene_prompt) as scene_builder:
+            result = service.generate_storyline_and_prompts(
+                title="Volcanoes",
+                content="Volcanoes erupt.",
+                num_scenes=2,
+                educational_level="basic",
+                education_level="advanced"
+            )
+
+        self.assertEqual(result["storyline"], "# Volcanoes\n\nA story about volcanoes.")
+        self.assertEqual(result["scene_prompts"], ["Scene 1: A mountain.", "Scene 2: Lava flows."])
+        self.assertEqual(len(service.client.calls), 1)
+        # Each education level reaches the builder it belongs to
+        self.assertEqual(storyline_builder.call_args.args[9], "basic")
+        self.assertEqual(scene_builder.call_args.args[5], "advanced")
+
+    def test_falls_back_to_separate_calls(self):
+        service = make_story_service([
+            "not json",
+            "# Volcanoes\n\nA story about volcanoes.",
+            "Scene 1: A mountain.\nScene 2: Lava flows."
+        ])
+
+        result = service.generate_storyline_and_prompts(
+            title="Volcanoes",
+            content="Volcanoes erupt.",
+            num_scenes=2,
+            education_level="advanced"
+        )
+
+        self.assertEqual(len(service.client.calls), 3)
+        self.assertEqual(result["storyline"], "# Volcanoes\n\nA story about volcanoes.")
+        self.assertEqual(len(result["scene_prompts"]), 2)
+        self.assertTrue(result["scene_prompts"][0].startswith("Scene 1:"))
+
+
+if __name__ == '__main__':
+    unittest.main()
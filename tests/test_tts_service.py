@@ -0,0 +1,37 @@
+"""
+TTSService tests
+Synthesis is stubbed out, so gTTS is never called
+"""
+
+import unittest
+from unittest import mock
+
+from services.tts_service import TTSService
+
+
+class GenerateSceneAudiosTest(unittest.TestCase):
+    """generate_scene_audios / iter_scene_audios"""
+
+    def setUp(self):
+        self.service = TTSService()
+        patcher = mock.patch.object(self.service, 'synthesize_to_mp3', lambda text, *args: text.encode())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_scene_numbers_from_data_key_or_none(self):
+        narrations = {"narrations": {
+            "intro": {"narration": "Welcome"},
+            "scene_1": {"narration": "First"},
+            "closing": {"narration": "Bye", "scene_number": 7}
+        }}
+
+        scene_audios = self.service.generate_scene_audios(narrations)
+
+        self.assertEqual(
+            [(rec.key, rec.scene_number, rec.audio) for rec in scene_audios],
+            [("intro", None, b"Welcome"), ("scene_1", 1, b"First"), ("closing", 7, b"Bye")]
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -13,7 +13,9 @@ from .helpers import (
     truncate_text,
     parse_resolution,
     estimate_words_from_duration,
-    estimate_duration_from_words
+    estimate_duration_from_words,
+    b64encode_str,
+    b64decode
 )
 
 from .validation import (
@@ -33,9 +35,25 @@ from .validation import (
     validate_aspect_ratio,
     validate_positive_float,
     validate_percentage,
+    validate_base64,
     RequestValidator
 )
 
+from .lazy_blueprint import LazyBlueprint
+from .orjson_provider import OrJSONProvider, json_bytes, json_response, conditional_json_response, content_etag
+from .schemas import (
+    StorageUploadRequest,
+    StoragePathRequest,
+    StorageSignedUrlRequest,
+    StorageListRequest,
+    StorylineRequest,
+    ScenePromptsRequest,
+    CompleteStoryRequest,
+    StoryBatchItem,
+    CompleteStoryBatchRequest,
+    decode_request
+)
+
 __all__ = [
     # helpers
     'sanitize_filename',
@@ -48,6 +66,8 @@ __all__ = [
     'parse_resolution',
     'estimate_words_from_duration',
     'estimate_duration_from_words',
+    'b64encode_str',
+    'b64decode',
     # validation
     'validate_language_code',
     'validate_tld',
@@ -65,6 +85,26 @@ __all__ = [
     'validate_aspect_ratio',
     'validate_positive_float',
     'validate_percentage',
-    'RequestValidator'
+    'validate_base64',
+    'RequestValidator',
+    # lazy blueprints
+    'LazyBlueprint',
+    # JSON
+    'OrJSONProvider',
+    'json_bytes',
+    'json_response',
+    'conditional_json_response',
+    'content_etag',
+    # request schemas
+    'StorageUploadRequest',
+    'StoragePathRequest',
+    'StorageSignedUrlRequest',
+    'StorageListRequest',
+    'StorylineRequest',
+    'ScenePromptsRequest',
+    'CompleteStoryRequest',
+    'StoryBatchItem',
+    'CompleteStoryBatchRequest',
+    'decode_request'
 ]
 
@@ -6,11 +6,18 @@ Common helper functions used across the application
 import re
 import os
 import logging
-from typing import Any, Dict, Optional
+from functools import lru_cache
+from typing import Any, Dict, Optional, Union
+# SIMD-accelerated drop-in for the stdlib base64 module
+import pybase64
 
 logger = logging.getLogger("VidyAI_Flask")
 
+# Characters not allowed in filenames on at least one supported OS
+_INVALID_FILENAME_CHARS = re.compile(r'[\\/*?:"<>|]')
 
+
+@lru_cache(maxsize=1024)
 def sanitize_filename(filename: str) -> str:
     """
     Sanitize a string to be used as a filename
@@ -22,7 +29,7 @@ def sanitize_filename(filename: str) -> str:
         Sanitized filename safe for all operating systems
     """
     # Replace invalid characters with underscores
-    sanitized = re.sub(r'[\\/*?:"<>|]', '_', filename)
+    sanitized = _INVALID_FILENAME_CHARS.sub('_', filename)
     # Limit filename length
     return sanitized[:200]
 
@@ -202,3 +209,28 @@ def estimate_duration_from_words(words: int, speed: float = 1.0) -> float:
     seconds = words / 2.5 / speed
     return seconds
 
+
+def b64encode_str(data: bytes) -> str:
+    """
+    Base64-encode bytes into a str (for JSON payloads)
+    
+    Args:
+        data: Raw bytes
+        
+    Returns:
+        Base64 string
+    """
+    return pybase64.b64encode_as_string(data)
+
+
+def b64decode(data: Union[str, bytes]) -> bytes:
+    """
+    Decode a base64 string or bytes
+    
+    Args:
+        data: Base64-encoded data
+        
+    Returns:
+        Decoded bytes
+    """
+    return pybase64.b64decode(data)
@@ -0,0 +1,66 @@
+"""
+Lazy Blueprint Loading
+Defers importing a blueprint module until the first request under its prefix
+"""
+
+import importlib
+import logging
+import threading
+from typing import Optional
+from flask import Flask, request
+
+logger = logging.getLogger("VidyAI_Flask")
+
+LAZY_METHODS = ['GET', 'POST', 'PUT', 'PATCH', 'DELETE']
+
+
+class LazyBlueprint:
+    """
+    Catch-all view that imports a blueprint on first use and dispatches to it
+
+    Flask refuses new routes once the app has handled a request, so the real
+    blueprint is registered on a private routing-only app instead. Requests
+    under the prefix are matched against that app's URL map and the matched
+    view runs inside the main app's request context, so CORS, logging hooks
+    and error handlers behave exactly as for an eagerly registered blueprint.
+    """
+
+    def __init__(self, import_name: str, attr_name: str, url_prefix: str):
+        """
+        Args:
+            import_name: Module that defines the blueprint (e.g. 'routes.video_routes')
+            attr_name: Blueprint attribute in that module (e.g. 'video_bp')
+            url_prefix: URL prefix the blueprint is served under
+        """
+        self.import_name = import_name
+        self.attr_name = attr_name
+        self.url_prefix = url_prefix
+        self._routing_app: Optional[Flask] = None
+        self._lock = threading.Lock()
+
+    def _load(self) -> Flask:
+        """Import the blueprint module and build its URL map (once)"""
+        if self._routing_app is None:
+            with self._lock:
+                if self._routing_app is None:
+                    module = importlib.import_module(self.import_name)
+                    routing_app = Flask(self.import_name)
+                    routing_app.register_blueprint(getattr(module, self.attr_name), url_prefix=self.url_prefix)
+                    logger.info("Lazily loaded blueprint %s at %s", self.attr_name, self.url_prefix)
+                    self._routing_app = routing_app
+        return self._routing_app
+
+    def __call__(self, subpath: str = ''):
+        routing_app = self._load()
+        # Raises NotFound / MethodNotAllowed, handled by the main app
+        endpoint, view_args = routing_app.url_map.bind_to_environ(request.environ).match()
+        return routing_app.view_functions[endpoint](**view_args)
+
+    def register(self, app: Flask) -> None:
+        """Add the catch-all rule for this blueprint's prefix to the app"""
+        app.add_url_rule(
+            f"{self.url_prefix}/<path:subpath>",
+            endpoint=f"lazy_{self.attr_name}",
+            view_func=self,
+            methods=LAZY_METHODS
+        )
@@ -0,0 +1,139 @@
+"""
+Request Schemas
+Typed request bodies, parsed and validated in a single msgspec pass
+"""
+
+from typing import List, Optional, Tuple, Type, TypeVar
+import msgspec
+
+T = TypeVar("T", bound=msgspec.Struct)
+
+# Concepts kept out of generated images unless the client overrides them
+DEFAULT_NEGATIVE_CONCEPTS = ('text', 'letters', 'watermark', 'logo', 'caption', 'speech bubble', 'ui')
+
+
+def _default_negative_concepts() -> List[str]:
+    """Fresh copy of DEFAULT_NEGATIVE_CONCEPTS for a decoded request"""
+    return list(DEFAULT_NEGATIVE_CONCEPTS)
+
+
+class StorageUploadRequest(msgspec.Struct):
+    """Body of POST /api/storage/upload (JSON form)"""
+    bucket: str
+    path: str
+    file_data: str
+    content_type: Optional[str] = None
+
+
+class StoragePathRequest(msgspec.Struct):
+    """Body of storage endpoints addressing a single file (download, delete, get-url, upload-signed-url)"""
+    bucket: str
+    path: str
+
+
+class StorageSignedUrlRequest(msgspec.Struct):
+    """Body of POST /api/storage/download-url"""
+    bucket: str
+    path: str
+    expires_in: int = 300
+
+
+class StorageListRequest(msgspec.Struct):
+    """Body of POST /api/storage/list"""
+    bucket: str
+    path: Optional[str] = ''
+
+
+# Optional story fields accept null (passed through as None), as the dict.get()
+# handlers they replaced did; only the required fields must be strings
+
+class StorylineRequest(msgspec.Struct):
+    """Body of POST /api/story/generate-storyline"""
+    title: str
+    content: str
+    target_length: Optional[str] = 'medium'
+    max_chars: Optional[int] = 25000
+    tone: Optional[str] = 'casual'
+    target_audience: Optional[str] = 'general'
+    complexity: Optional[str] = 'moderate'
+    focus_style: Optional[str] = 'comprehensive'
+    scene_count: Optional[int] = None
+    educational_level: Optional[str] = 'intermediate'
+    visual_style: Optional[str] = 'educational'
+
+
+class ScenePromptsRequest(msgspec.Struct):
+    """Body of POST /api/story/generate-scenes"""
+    title: str
+    storyline: str
+    comic_style: Optional[str] = 'western comic'
+    num_scenes: Optional[int] = 10
+    age_group: Optional[str] = 'general'
+    education_level: Optional[str] = 'intermediate'
+    visual_detail: Optional[str] = 'moderate'
+    camera_style: Optional[str] = 'varied'
+    color_palette: Optional[str] = 'natural'
+    scene_pacing: Optional[str] = 'moderate'
+    negative_concepts: Optional[List[str]] = msgspec.field(default_factory=_default_negative_concepts)
+    character_sheet: Optional[str] = ''
+    style_sheet: Optional[str] = ''
+
+
+class CompleteStoryRequest(msgspec.Struct):
+    """Body of POST /api/story/generate-complete"""
+    title: str
+    content: str
+    target_length: Optional[str] = 'medium'
+    max_chars: Optional[int] = 25000
+    comic_style: Optional[str] = 'western comic'
+    num_scenes: Optional[int] = 10
+    age_group: Optional[str] = 'general'
+    education_level: Optional[str] = 'standard'
+    negative_concepts: Optional[List[str]] = msgspec.field(default_factory=_default_negative_concepts)
+    character_sheet: Optional[str] = ''
+    style_sheet: Optional[str] = ''
+
+
+class StoryBatchItem(msgspec.Struct):
+    """One article in POST /api/story/generate-complete-batch"""
+    title: str
+    content: str
+
+
+class CompleteStoryBatchRequest(msgspec.Struct):
+    """Body of POST /api/story/generate-complete-batch"""
+    items: List[StoryBatchItem]
+    target_length: Optional[str] = 'medium'
+    max_chars: Optional[int] = 25000
+    comic_style: Optional[str] = 'western comic'
+    num_scenes: Optional[int] = 10
+    age_group: Optional[str] = 'general'
+    education_level: Optional[str] = 'standard'
+    negative_concepts: Optional[List[str]] = msgspec.field(default_factory=_default_negative_concepts)
+    character_sheet: Optional[str] = ''
+    style_sheet: Optional[str] = ''
+
+
+def decode_request(body: bytes, schema: Type[T]) -> Tuple[Optional[T], Optional[str]]:
+    """
+    Decode and validate a JSON request body against a schema
+    
+    Decoding is lax about scalar types, as the dict.get() handlers it replaced
+    were: numbers and booleans sent as strings (e.g. "10") are converted.
+
+    Args:
+        body: Raw request body (request.get_data())
+        schema: msgspec.Struct subclass describing the body
+
+    Returns:
+        (instance, None) on success, or (None, error message) if the body is
+        empty or malformed JSON, is missing a required field, or has a field
+        of the wrong type. The message names the offending field.
+    """
+    if not body:
+        return None, 'Request body must be a JSON object'
+    try:
+        return msgspec.json.decode(body, type=schema, strict=False), None
+    except msgspec.DecodeError as e:
+        # ValidationError is a DecodeError subclass
+        return None, f'Invalid request body: {e}'
@@ -8,6 +8,11 @@ from typing import Any, Dict, Optional, List
 
 logger = logging.getLogger("VidyAI_Flask")
 
+# Base64 alphabet, without the '=' padding character
+_B64_ALPHABET = b'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/'
+# Line breaks tolerated anywhere in a base64 payload
+_B64_LINE_BREAKS = b'\n\r'
+
 
 def validate_language_code(lang: str) -> bool:
     """Validate language code"""
@@ -113,6 +118,26 @@ def validate_percentage(value: float) -> bool:
     return isinstance(value, (int, float)) and 0 <= value <= 1
 
 
+def validate_base64(data: str) -> bool:
+    """
+    Validate that a string is well-formed padded base64
+    
+    Line breaks are ignored. The rest must be a multiple of 4 characters
+    from the base64 alphabet, with '=' only as one or two trailing characters.
+    """
+    if not data.isascii():
+        return False
+    
+    encoded = data.encode('ascii').translate(None, _B64_LINE_BREAKS)
+    if len(encoded) % 4:
+        return False
+    
+    # bytes.translate deletes alphabet bytes in one C pass; only the
+    # trailing padding may be left over
+    padding = 2 if encoded.endswith(b'==') else 1 if encoded.endswith(b'=') else 0
+    return encoded.translate(None, _B64_ALPHABET) == b'=' * padding
+
+
 class RequestValidator:
     """Request validation helper class"""
     